@@ -0,0 +1,72 @@
+import os
+import queue
+import traceback
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+# ====================== CONSTANTS ======================
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+POLL_MS = 50
+
+# Shared by every window; pandas and scikit-learn release the GIL for the heavy parts
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="candidate-worker")
+
+# ====================== TASK RUNNER ======================
+class TaskRunner:
+    """Runs jobs on the worker pool and hands their results back on the Tk main loop"""
+    # Tk widgets may only be touched from the main thread, so finished jobs are
+    # queued and their callbacks run from a root.after poll.
+    def __init__(self, root, progress=None, status_label=None, poll_ms=POLL_MS):
+        self.root = root
+        self.progress = progress
+        self.status_label = status_label
+        self.poll_ms = poll_ms
+        self.results = queue.Queue()
+        self.pending = 0
+
+    def submit(self, job, on_done=None, on_error=None, description="Working..."):
+        """Run job() in the background, then on_done(result) or on_error(exc) on the main thread"""
+        self.pending += 1
+        self._show_busy(description)
+        future = _executor.submit(job)
+        future.add_done_callback(lambda f: self.results.put((f, on_done, on_error)))
+        if self.pending == 1:
+            self.root.after(self.poll_ms, self._poll)
+        return future
+
+    def _poll(self):
+        while True:
+            try:
+                future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            error = future.exception()
+            if error is None:
+                if on_done is not None:
+                    on_done(future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                traceback.print_exception(type(error), error, error.__traceback__)
+
+        try:
+            if self.pending:
+                self.root.after(self.poll_ms, self._poll)
+            else:
+                self._show_idle()
+        except tk.TclError:
+            # A callback closed the window; nothing is left to update
+            pass
+
+    def _show_busy(self, description):
+        if self.progress is not None and self.pending == 1:
+            self.progress.start(10)
+        if self.status_label is not None:
+            self.status_label.config(text=description)
+
+    def _show_idle(self):
+        if self.progress is not None:
+            self.progress.stop()
+        if self.status_label is not None:
+            self.status_label.config(text="")
@@ -0,0 +1,122 @@
+import argparse
+import os
+import sys
+import time
+import pandas as pd
+from constants import CSV_FILE
+from validation import CHOICE_FIELDS, EMPLOYED_VALUES, FORM_DEFAULTS, REQUIRED_FIELDS, validate_application
+from dataset import load_credentials
+from skills import SkillMatrix, SkillVocabulary
+from shards import RoleShards
+from random_forest_priority import peak_rss_mb, predict_priority_scores
+from feedback import generate_feedback
+
+# ====================== CONSTANTS ======================
+CHUNK_SIZE = 50000  # rows read, validated and scored at a time
+NUMERIC_INPUTS = ['Age', 'YearsCode', 'YearsCodePro', 'PreviousSalary', 'ComputerSkills']
+# Checked like the form's widgets; blank or missing ones take the form's defaults, except JobRole
+OPTIONAL_INPUTS = list(CHOICE_FIELDS) + ['ComputerSkills', 'Employed']
+
+# ====================== BATCH PIPELINE ======================
+def read_chunks(input_file, chunk_size=CHUNK_SIZE):
+    """Stream the input CSV as frames of raw text, as the form would have received it"""
+    # Row labels keep counting across chunks, so they number the input rows from 0
+    return pd.read_csv(input_file, dtype=str, keep_default_na=False, chunksize=chunk_size)
+
+def taken_usernames(csv_file=CSV_FILE):
+    """Lowercased usernames already registered in the dataset"""
+    return set(load_credentials(csv_file))
+
+def fill_defaults(chunk):
+    """Give the optional columns the form's default wherever a row leaves them blank"""
+    for col in OPTIONAL_INPUTS:
+        values = chunk[col].str.strip() if col in chunk.columns else pd.Series("", index=chunk.index)
+        if col in FORM_DEFAULTS:
+            values = values.mask(values == "", str(FORM_DEFAULTS[col]))
+        chunk[col] = values
+    return chunk
+
+def validate_chunk(chunk, usernames):
+    """Split a chunk into (valid rows, rejected rows with an Error column); usernames grows as rows pass"""
+    errors = []
+    names = list(REQUIRED_FIELDS) + OPTIONAL_INPUTS
+    for values in zip(*(chunk[col].tolist() for col in names)):
+        fields = dict(zip(names, values))
+        error = validate_application(fields, usernames)
+        if error is None:
+            # Later rows cannot reuse the username, as with a second registration
+            usernames.add(fields['Username'].strip().lower())
+        errors.append(error)
+    errors = pd.Series(errors, index=chunk.index, dtype=object)
+    valid = errors.isna()
+    rejected = chunk[~valid].assign(Error=errors[~valid])
+    return chunk[valid].copy(), rejected
+
+def score_chunk(rows, shards, skills):
+    """Add PriorityScore and Feedback to validated rows, scoring each JobRole with its model"""
+    for col in NUMERIC_INPUTS:
+        rows[col] = pd.to_numeric(rows[col], errors='coerce').fillna(0)
+    # Validated already, so every value is one of the accepted spellings; stored as 0/1 like the dataset
+    rows['Employed'] = rows['Employed'].str.lower().map(EMPLOYED_VALUES).astype('int8')
+    # One tokenizing pass serves both the model and the feedback rules
+    skills.build(rows)
+    rows['PriorityScore'] = 0.0
+    roles = rows['JobRole'].astype(str)
+    for role, labels in roles.groupby(roles, sort=False).groups.items():
+        rows.loc[labels, 'PriorityScore'] = predict_priority_scores(rows.loc[labels], shards[role].model(), skills)
+    rows['Feedback'] = generate_feedback(rows, skills)
+    return rows
+
+def run(input_file, output_file, errors_file, chunk_size=CHUNK_SIZE, csv_file=CSV_FILE, log=sys.stderr):
+    """Validate, score and write every row of input_file; returns (rows scored, rows rejected)"""
+    # Only one chunk is held at a time; the taken usernames are the one thing that grows with the input
+    usernames = taken_usernames(csv_file)
+    shards = RoleShards()
+    # Shared across chunks, so each skill is interned once
+    vocabulary = SkillVocabulary()
+    scored = rejected = 0
+    start = time.perf_counter()
+    with open(output_file, "w", newline="", encoding="utf-8") as out, \
+         open(errors_file, "w", newline="", encoding="utf-8") as errors:
+        for number, chunk in enumerate(read_chunks(input_file, chunk_size)):
+            if number == 0:
+                missing = [col for col in REQUIRED_FIELDS if col not in chunk.columns]
+                if missing:
+                    raise ValueError(f"{input_file} is missing required columns: {', '.join(missing)}")
+            rows, bad_rows = validate_chunk(fill_defaults(chunk), usernames)
+            rows = score_chunk(rows, shards, SkillMatrix(vocabulary))
+            # Row is the 1-based position of the record in the input, not counting the header
+            rows.insert(0, 'Row', rows.index + 1)
+            bad_rows.insert(0, 'Row', bad_rows.index + 1)
+            rows.to_csv(out, header=number == 0, index=False)
+            bad_rows.to_csv(errors, header=number == 0, index=False)
+            scored += len(rows)
+            rejected += len(bad_rows)
+            elapsed = time.perf_counter() - start
+            peak = peak_rss_mb()
+            print(f"{scored + rejected:>10} rows  {(scored + rejected) / elapsed:>9.0f} rows/s  "
+                  f"{rejected:>8} rejected  peak {'n/a' if peak is None else f'{peak:.0f} MB'}", file=log)
+    return scored, rejected
+
+# ====================== COMMAND LINE ======================
+def main(argv=None):
+    """Score a CSV of applications without the GUI"""
+    parser = argparse.ArgumentParser(description="Validate, score and write feedback for a CSV of candidates")
+    parser.add_argument("input", help="CSV of applications, with the registration form's columns")
+    parser.add_argument("output", help="scored rows: the input columns plus PriorityScore and Feedback")
+    parser.add_argument("--errors", default=None, help="rows that failed validation (default: <output>.errors.csv)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows processed at a time")
+    parser.add_argument("--csv", default=CSV_FILE, help="dataset whose usernames are already taken")
+    args = parser.parse_args(argv)
+
+    errors_file = args.errors or os.path.splitext(args.output)[0] + ".errors.csv"
+    start = time.perf_counter()
+    try:
+        scored, rejected = run(args.input, args.output, errors_file, args.chunk_size, args.csv)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{scored} scored -> {args.output}, {rejected} rejected -> {errors_file} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
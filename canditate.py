@@ -1,17 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import pandas as pd
-import os
-from sklearn.preprocessing import LabelEncoder
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from random_forest_priority import initialize_priority_system, predict_priority_score
+from importlib import import_module
+import os
+import threading
+import time
+from constants import CSV_FILE, JOB_ROLES, ID_COLUMN
+from background import TaskRunner
+from virtual_tree import VirtualTreeview
+from validation import (ED_LEVELS, FORM_DEFAULTS, GENDERS, MAX_COMPUTER_SKILLS, MENTAL_HEALTH_LEVELS,
+                        MIN_COMPUTER_SKILLS, validate_application)
+
+_process_start = time.perf_counter()
 
 # ====================== CONSTANTS ======================
-JOB_ROLES = ["Web Developer", "Project Manager", "Business Analyst", "HR Specialist", 
-             "Data Scientist", "UX Designer", "DevOps Engineer", "Marketing Manager", 
-             "Financial Analyst", "Sales Executive"]
 BG_COLOR = "#f5f5f5"
 HEADER_COLOR = "#2E7D32"
 BUTTON_COLOR = "#1B5E20"
@@ -19,135 +21,210 @@ TEXT_COLOR = "#333333"
 ACCENT_COLOR = "#2E7D32"
 ERROR_COLOR = "#c62828"
 ENTRY_BG = "#ffffff"
-CSV_FILE = "job_descriptions.csv"
+# Pause after the last keystroke before the search box filters the list
+SEARCH_DEBOUNCE_MS = 150
+# Set CANDIDATE_STARTUP_TIMINGS=1 to print how long each startup step took
+SHOW_STARTUP_TIMINGS = os.environ.get("CANDIDATE_STARTUP_TIMINGS") == "1"
 
-# Initialize the priority system
-model, priority_queue = initialize_priority_system()
+# ====================== INITIALIZE DATA ======================
+# pandas, scikit-learn and matplotlib take seconds to import, so they and the
+# dataset are loaded on a background thread while the login window is shown.
+df = None
+model = None
+shards = None
+ranking = None
+search_index = None
+skill_matrix = None
+encoders = {}
+credentials = {}
+startup_timings = {}
+_resources_ready = threading.Event()
+_loading_started = False
+_timings_reported = False
+_startup_error = None
 
-# ====================== AI FEEDBACK GENERATOR ======================
-def generate_ai_feedback(candidate_data):
-    feedback = []
-    role_requirements = {
-        "Data Scientist": ["Python", "SQL", "Machine Learning", "Statistics", "Data Analysis"],
-        "Web Developer": ["JavaScript", "HTML/CSS", "React", "Node.js", "Frontend"],
-        "DevOps Engineer": ["Docker", "Kubernetes", "AWS", "CI/CD", "Infrastructure"],
-        "Project Manager": ["Leadership", "Agile", "Scrum", "Communication", "Planning"],
-        "Business Analyst": ["SQL", "Excel", "Requirements", "Documentation", "Analysis"],
-        "UX Designer": ["Figma", "User Research", "Wireframing", "Prototyping", "UI/UX"],
-        "Marketing Manager": ["SEO", "Content", "Social Media", "Advertising", "Branding"],
-        "Financial Analyst": ["Excel", "Financial Modeling", "Accounting", "Forecasting", "Analysis"],
-        "Sales Executive": ["CRM", "Negotiation", "Communication", "Relationship", "Sales"],
-        "HR Specialist": ["Recruitment", "Employee Relations", "HR Policies", "Interviewing", "Compliance"]
-    }
-    
-    if candidate_data['JobRole'] in role_requirements:
-        missing_skills = [skill for skill in role_requirements[candidate_data['JobRole']] 
-                        if skill.lower() not in candidate_data['HaveWorkedWith'].lower()]
-        if missing_skills:
-            feedback.append(f"For {candidate_data['JobRole']} roles, we recommend gaining experience with: {', '.join(missing_skills)}")
-    
-    if candidate_data['YearsCodePro'] < 3:
-        feedback.append(f"More professional experience would strengthen your application (currently {candidate_data['YearsCodePro']} years). Consider internships or freelance work.")
-    elif candidate_data['YearsCodePro'] < 5:
-        feedback.append(f"While you have {candidate_data['YearsCodePro']} years of experience, additional professional experience would make you more competitive.")
-    
-    if candidate_data['EdLevel'] == "High School":
-        feedback.append("Consider pursuing higher education or professional certifications to be more competitive.")
-    elif candidate_data['EdLevel'] == "Bachelor" and candidate_data['JobRole'] in ["Data Scientist", "DevOps Engineer"]:
-        feedback.append("For this technical role, a Master's degree or specialized certifications could be beneficial.")
-    
-    if candidate_data['ComputerSkills'] < 5:
-        feedback.append(f"Your computer skills rating ({candidate_data['ComputerSkills']}/10) could be improved through courses or certifications.")
-    elif candidate_data['ComputerSkills'] < 8:
-        feedback.append(f"Your computer skills are decent ({candidate_data['ComputerSkills']}/10), but reaching 8+ would make you more competitive.")
-    
-    if candidate_data['MentalHealth'] == "Poor":
-        feedback.append("We noticed you reported poor mental health. Many companies offer wellness programs that could help.")
-    
-    if 'PreviousSalary' in candidate_data and candidate_data['PreviousSalary'] > 0:
-        avg_salaries = {
-            "Data Scientist": 120000, "Web Developer": 85000, "DevOps Engineer": 110000,
-            "Project Manager": 95000, "Business Analyst": 80000, "UX Designer": 75000,
-            "Financial Analyst": 90000, "Marketing Manager": 80000, "Sales Executive": 70000,
-            "HR Specialist": 65000
-        }
-        if candidate_data['JobRole'] in avg_salaries:
-            avg_salary = avg_salaries[candidate_data['JobRole']]
-            ratio = candidate_data['PreviousSalary'] / avg_salary
-            if ratio > 1.2:
-                feedback.append(f"Your previous salary (${candidate_data['PreviousSalary']:,.0f}) is significantly higher than average for this role (${avg_salary:,.0f}).")
-            elif ratio < 0.8:
-                feedback.append(f"Your previous salary (${candidate_data['PreviousSalary']:,.0f}) is below average for this role (${avg_salary:,.0f}), which could work in your favor.")
-    
-    return "AI Feedback:\n- " + "\n- ".join(feedback) if feedback else "No specific feedback available. Your profile looks good overall, but the competition was particularly strong for this role."
+def load_resources():
+    """Load the dataset, model, scores and credentials used by every page"""
+    global df, model, shards, ranking, search_index, skill_matrix, encoders, credentials
+    load_start = lap_start = time.perf_counter()
+    
+    def lap(step):
+        nonlocal lap_start
+        now = time.perf_counter()
+        startup_timings[step] = now - lap_start
+        lap_start = now
+    
+    from sklearn.preprocessing import LabelEncoder
+    from storage import get_store
+    from dataset import dataset_lock, get_dataset, record_changes, compact_integers
+    from random_forest_priority import load_or_train_model
+    from shards import RoleShards
+    from ranking import RankingIndex
+    from search import SearchIndex
+    from skills import SkillMatrix
+    lap('imports')
+    
+    df = get_dataset()
+    lap('load_dataset')
+    
+    # The shared all-roles model; each role's shard loads its own model and queue when first used
+    model = load_or_train_model(df)
+    lap('priority_system')
+    
+    # HaveWorkedWith is a list of skills, not a category; it is tokenized into skill_matrix
+    encoders = {col: LabelEncoder() for col in ['EdLevel', 'Country', 'Gender', 'JobRole']}
+    for col, encoder in encoders.items():
+        if col in df.columns:
+            unique_values = df[col].astype(str).unique()
+            encoder.fit(unique_values)
+            df[f'{col}_enc'] = compact_integers(encoder.transform(df[col].astype(str)))
+    lap('label_encoders')
+    
+    skill_matrix = SkillMatrix()
+    skill_matrix.build(df)
+    lap('skills')
+    
+    # Held until the ranking is built, so a role rescored in the background lands in it
+    with dataset_lock:
+        shards = RoleShards(dict.fromkeys(JOB_ROLES + df['JobRole'].dropna().astype(str).unique().tolist()),
+                            skill_matrix, scores_changed)
+        # Stored scores are kept; only unscored rows need a model, and only their roles' are loaded
+        rescored = shards.score(df, df.index[df['PriorityScore'].isna()], skill_matrix)
+        if len(rescored):
+            record_changes(df, rescored, ['PriorityScore'])
+        lap('scoring')
+        
+        ranking = RankingIndex()
+        ranking.build(df)
+        lap('ranking')
+    
+    search_index = SearchIndex(skill_matrix)
+    search_index.build(df)
+    lap('search_index')
+    
+    loaded_credentials = get_store(CSV_FILE).credentials()
+    loaded_credentials["admin"] = "admin123"
+    credentials = loaded_credentials
+    lap('credentials')
+    
+    # Imported only to warm the module cache, so the first chart opens without the wait
+    import_module('matplotlib.pyplot')
+    import_module('matplotlib.backends.backend_tkagg')
+    lap('plotting')
+    startup_timings['resources_total'] = time.perf_counter() - load_start
 
-# ====================== DATABASE FUNCTIONS ======================
-def load_dataset(csv_file=CSV_FILE):
-    if not os.path.exists(csv_file):
-        df = pd.DataFrame(columns=['Name', 'Age', 'Gender', 'EdLevel', 'YearsCode', 'YearsCodePro',
-                                 'Country', 'PreviousSalary', 'HaveWorkedWith', 'ComputerSkills',
-                                 'MentalHealth', 'Employed', 'JobRole', 'Username', 'Password',
-                                 'Status', 'Feedback', 'ApplicationDate'])
-        df.to_csv(csv_file, index=False)
-    else:
-        df = pd.read_csv(csv_file)
-    
-    required_cols = ['Name', 'Age', 'Gender', 'EdLevel', 'YearsCode', 'YearsCodePro',
-                    'Country', 'PreviousSalary', 'HaveWorkedWith', 'ComputerSkills',
-                    'MentalHealth', 'Employed', 'JobRole']
-    
-    for col in required_cols:
-        if col not in df.columns:
-            if col in ['Name', 'Gender', 'EdLevel', 'Country', 'HaveWorkedWith', 'JobRole']:
-                df[col] = ""
-            elif col in ['Age', 'YearsCode', 'YearsCodePro', 'ComputerSkills', 'PreviousSalary']:
-                df[col] = 0
-            elif col == 'Employed':
-                df[col] = False
-            elif col == 'MentalHealth':
-                df[col] = "Fair"
-    
-    if 'Username' not in df.columns:
-        df['Username'] = ""
-    if 'Password' not in df.columns:
-        df['Password'] = ""
-    if 'Status' not in df.columns:
-        df['Status'] = "Pending"
-    if 'Feedback' not in df.columns:
-        df['Feedback'] = ""
-    if 'ApplicationDate' not in df.columns:
-        df['ApplicationDate'] = datetime.now().strftime("%Y-%m-%d")
-    
-    return df
+def _load_resources_in_background():
+    global _startup_error
+    try:
+        load_resources()
+    except Exception as e:
+        _startup_error = e
+    finally:
+        _resources_ready.set()
 
-def save_dataset(df):
-    df.to_csv(CSV_FILE, index=False)
+def start_loading_resources():
+    """Begin loading resources on a daemon thread; returns immediately"""
+    global _loading_started
+    if not _loading_started:
+        _loading_started = True
+        threading.Thread(target=_load_resources_in_background, daemon=True).start()
 
-# ====================== INITIALIZE DATA ======================
-df = load_dataset()
-save_dataset(df)
+def resources_ready():
+    return _resources_ready.is_set()
 
-encoders = {col: LabelEncoder() for col in ['EdLevel', 'Country', 'HaveWorkedWith', 'Gender', 'JobRole']}
-for col, encoder in encoders.items():
-    if col in df.columns:
-        unique_values = df[col].astype(str).unique()
-        encoder.fit(unique_values)
-        df[f'{col}_enc'] = encoder.transform(df[col].astype(str))
+def wait_for_resources():
+    """Block until background loading has finished, re-raising any error it hit"""
+    # Also covers callers that never started the background load
+    start_loading_resources()
+    _resources_ready.wait()
+    if _startup_error is not None:
+        raise _startup_error
 
-def calculate_priority(row):
-    """Calculate priority score using the Random Forest model"""
-    global model, df
-    candidate_data = row.to_dict()
-    return predict_priority_score(candidate_data, model, df)
+def format_startup_timings():
+    return "\n".join(f"{step:>18}: {seconds * 1000:8.1f} ms" for step, seconds in startup_timings.items())
 
-if 'PriorityScore' not in df.columns:
-    df['PriorityScore'] = df.apply(calculate_priority, axis=1)
+# ====================== BACKGROUND JOBS ======================
+# These run on worker threads; they hold dataset_lock while touching the shared frame.
+def register_candidate(new_user):
+    """Add, score and persist a new applicant, returning (CandidateId, priority score)"""
+    from dataset import dataset_lock, get_dataset, add_candidates, append_candidates, is_buffered
+    
+    with dataset_lock:
+        # The new row waits outside the shared table until a batch of them is merged,
+        # so it is scored and saved on its own unless the whole table is needed
+        new_rows = add_candidates([new_user])
+        new_label = new_rows.index[0]
+        frame = new_rows if is_buffered(new_rows) else get_dataset()
+        search_index.add(new_label, new_user)
+        skill_matrix.set_skills(new_label, new_user['HaveWorkedWith'])
+        # Scored with the role's model, picking up one retrained in the background or from the command line
+        rescored = shards.score(frame, [new_label], skill_matrix, table=get_dataset)
+        if not is_buffered(new_rows):
+            frame = get_dataset()
+        append_candidates(frame, [new_label])
+        
+        ranking.update_rows(frame, [new_label])
+        for queue, queued_labels in shards.queued(frame, [new_label]):
+            queue.add_rows(frame.loc[queued_labels])
+        # Other rows of the role whose features changed are scored too; journal just those
+        rescored = rescored.drop(new_label, errors='ignore')
+        if len(rescored):
+            scores_changed(frame, rescored)
+        return new_label, frame.at[new_label, 'PriorityScore']
 
-credentials = {}
-for _, row in df.iterrows():
-    if isinstance(row['Username'], str) and row['Username'].strip():
-        credentials[row['Username'].strip().lower()] = row['Password']
-credentials["admin"] = "admin123"
+def scores_changed(frame, labels):
+    """Carry new scores of stored candidates into the ranking, the review queues and storage"""
+    # Called with dataset_lock held; a role rescored after its model changed ends up here
+    from dataset import record_changes
+    
+    if ranking is not None:
+        ranking.update_rows(frame, labels)
+    for queue, queued_labels in shards.queued(frame, labels):
+        queue.update_scores(frame, queued_labels)
+    record_changes(frame, labels, ['PriorityScore'])
+
+def change_statuses(labels, new_status):
+    """Set the status of several candidates, generating feedback for rejections, with one write"""
+    from dataset import dataset_lock, get_dataset, record_changes
+    from feedback import generate_feedback
+    
+    labels = list(labels)
+    with dataset_lock:
+        frame = get_dataset()
+        frame.loc[labels, 'Status'] = new_status
+        if new_status == "Rejected":
+            frame.loc[labels, 'Feedback'] = generate_feedback(frame.loc[labels], skill_matrix)
+        record_changes(frame, labels, ['Status', 'Feedback'])
+        ranking.update_rows(frame, labels)
+        # Only Pending candidates wait in the review queues
+        for queue, queued_labels in shards.queued(frame, labels):
+            if new_status == "Pending":
+                queue.add_rows(frame.loc[queued_labels])
+            else:
+                queue.remove_candidates(queued_labels)
+    
+    # Enough new decisions trigger a background retrain; it never blocks this job
+    shards.record_decisions(frame, labels)
+    return labels
+
+def requeue_candidates(labels):
+    """Return candidates taken off the review queue to it, if they are still Pending"""
+    from dataset import dataset_lock, get_dataset
+    
+    with dataset_lock:
+        frame = get_dataset()
+        for queue, queued_labels in shards.queued(frame, list(labels)):
+            rows = frame.loc[queued_labels]
+            queue.add_rows(rows[rows['Status'] == "Pending"])
+
+def read_candidates(labels, columns=None):
+    """Copy rows of the shared table for the UI thread, taking the lock the workers write under"""
+    from dataset import dataset_lock, get_dataset
+    
+    with dataset_lock:
+        frame = get_dataset()
+        rows = frame.loc[labels] if columns is None else frame.loc[labels, columns]
+        return rows.copy()
 
 # ====================== GUI CLASSES ======================
 class LoginPage:
@@ -187,15 +264,40 @@ class LoginPage:
         button_frame = tk.Frame(main_frame, bg=BG_COLOR)
         button_frame.pack(pady=20)
         
-        tk.Button(button_frame, text="Admin Login", command=self.admin_login, 
-                 font=self.label_font, bg=BUTTON_COLOR, fg="white", 
-                 relief=tk.FLAT, bd=0, padx=20, pady=8).pack(fill=tk.X, pady=5)
-        tk.Button(button_frame, text="User Login", command=self.user_login, 
-                 font=self.label_font, bg=BUTTON_COLOR, fg="white", 
-                 relief=tk.FLAT, bd=0, padx=20, pady=8).pack(fill=tk.X, pady=5)
-        tk.Button(button_frame, text="Register", command=self.register, 
-                 font=self.label_font, bg=BUTTON_COLOR, fg="white", 
-                 relief=tk.FLAT, bd=0, padx=20, pady=8).pack(fill=tk.X, pady=5)
+        # Every page needs the candidate data, so the buttons wait for it to load
+        self.buttons = []
+        for text, command in [("Admin Login", self.admin_login), ("User Login", self.user_login),
+                              ("Register", self.register)]:
+            button = tk.Button(button_frame, text=text, command=command, state=tk.DISABLED, 
+                               font=self.label_font, bg=BUTTON_COLOR, fg="white", 
+                               relief=tk.FLAT, bd=0, padx=20, pady=8)
+            button.pack(fill=tk.X, pady=5)
+            self.buttons.append(button)
+        
+        self.loading_label = tk.Label(main_frame, text="", font=("Arial", 10), 
+                                      bg=BG_COLOR, fg=TEXT_COLOR)
+        self.loading_label.pack()
+        start_loading_resources()
+        self.check_loading()
+    
+    def check_loading(self):
+        """Show background loading progress until candidate data is ready, then enable the buttons"""
+        global _timings_reported
+        if resources_ready():
+            if _startup_error is not None:
+                self.loading_label.config(text="Candidate data could not be loaded", fg=ERROR_COLOR)
+                messagebox.showerror("Error", f"Could not load candidate data: {_startup_error}")
+                return
+            total = startup_timings.get('resources_total')
+            self.loading_label.config(text=f"Candidate data loaded in {total:.1f}s" if total else "")
+            for button in self.buttons:
+                button.config(state=tk.NORMAL)
+            if SHOW_STARTUP_TIMINGS and not _timings_reported:
+                _timings_reported = True
+                print("Startup timings:\n" + format_startup_timings())
+        else:
+            self.loading_label.config(text="Loading candidate data...")
+            self.root.after(100, self.check_loading)
     
     def admin_login(self):
         if self.username_entry.get() == "admin" and self.password_entry.get() == "admin123":
@@ -263,8 +365,8 @@ class RegistrationPage:
         fields = [
             ("Full Name:", "name_entry", None),
             ("Age:", "age_entry", None),
-            ("Gender:", "gender_var", ["Male", "Female", "Other"]),
-            ("Education Level:", "edlevel_var", ["High School", "Bachelor", "Master", "PhD"]),
+            ("Gender:", "gender_var", GENDERS),
+            ("Education Level:", "edlevel_var", ED_LEVELS),
             ("Country:", "country_entry", None)
         ]
         
@@ -297,7 +399,7 @@ class RegistrationPage:
             ("Professional Coding Experience (years):", "years_pro_entry", None),
             ("Technologies Worked With:", "skills_entry", None),
             ("Computer Skills (1-10):", "comp_skills_var", None),
-            ("Mental Health:", "mental_var", ["Good", "Fair", "Poor"]),
+            ("Mental Health:", "mental_var", MENTAL_HEALTH_LEVELS),
             ("Currently Employed:", "employed_var", None),
             ("Previous Salary (USD):", "salary_entry", None)
         ]
@@ -314,8 +416,8 @@ class RegistrationPage:
                     tk.Radiobutton(frame, text=option, variable=getattr(self, var_name), 
                                   value=option, font=self.label_font, bg=BG_COLOR).pack(side=tk.LEFT, padx=5)
             elif var_name == "comp_skills_var":
-                setattr(self, var_name, tk.IntVar(value=5))
-                tk.Scale(form_frame, from_=1, to=10, orient=tk.HORIZONTAL, 
+                setattr(self, var_name, tk.IntVar(value=FORM_DEFAULTS['ComputerSkills']))
+                tk.Scale(form_frame, from_=MIN_COMPUTER_SKILLS, to=MAX_COMPUTER_SKILLS, orient=tk.HORIZONTAL, 
                          variable=getattr(self, var_name), font=self.label_font, 
                          bg=BG_COLOR, fg=TEXT_COLOR).grid(row=i+7, column=1, sticky="ew", pady=5, padx=10)
             elif var_name == "employed_var":
@@ -349,62 +451,41 @@ class RegistrationPage:
         button_frame = tk.Frame(form_frame, bg=BG_COLOR)
         button_frame.grid(row=18, column=0, columnspan=2, pady=20)
         
-        tk.Button(button_frame, text="Submit Application", command=self.submit_application, 
+        self.submit_button = tk.Button(button_frame, text="Submit Application", command=self.submit_application, 
                  font=self.header_font, bg=BUTTON_COLOR, fg="white", 
-                 relief=tk.FLAT, bd=0, padx=20, pady=8).pack(side=tk.LEFT, padx=10)
+                 relief=tk.FLAT, bd=0, padx=20, pady=8)
+        self.submit_button.pack(side=tk.LEFT, padx=10)
         tk.Button(button_frame, text="Back to Login", command=self.back_to_login, 
                  font=self.header_font, bg=ERROR_COLOR, fg="white", 
                  relief=tk.FLAT, bd=0, padx=20, pady=8).pack(side=tk.LEFT, padx=10)
         
+        progress_frame = tk.Frame(form_frame, bg=BG_COLOR)
+        progress_frame.grid(row=19, column=0, columnspan=2)
+        progress = ttk.Progressbar(progress_frame, mode="indeterminate", length=200)
+        progress.pack(side=tk.LEFT, padx=5)
+        status_label = tk.Label(progress_frame, text="", font=self.label_font, bg=BG_COLOR, fg=TEXT_COLOR)
+        status_label.pack(side=tk.LEFT, padx=5)
+        self.runner = TaskRunner(root, progress, status_label)
+        
         form_frame.columnconfigure(1, weight=1)
     
+    def form_fields(self):
+        return {
+            'Name': self.name_entry.get(),
+            'Age': self.age_entry.get(),
+            'Country': self.country_entry.get(),
+            'YearsCode': self.years_code_entry.get(),
+            'YearsCodePro': self.years_pro_entry.get(),
+            'HaveWorkedWith': self.skills_entry.get(),
+            'PreviousSalary': self.salary_entry.get(),
+            'Username': self.username_entry.get()
+        }
+    
     def validate_fields(self):
-        required_fields = [
-            (self.name_entry, "Full Name"),
-            (self.age_entry, "Age"),
-            (self.country_entry, "Country"),
-            (self.years_code_entry, "Total Coding Experience"),
-            (self.years_pro_entry, "Professional Coding Experience"),
-            (self.skills_entry, "Technologies Worked With"),
-            (self.salary_entry, "Previous Salary"),
-            (self.username_entry, "Username")
-        ]
-        
-        for field, name in required_fields:
-            if not field.get().strip():
-                messagebox.showerror("Error", f"Please fill in the {name} field")
-                return False
-        
-        try:
-            age = int(self.age_entry.get())
-            if age < 18 or age > 70:
-                messagebox.showerror("Error", "Age must be between 18 and 70")
-                return False
-        except ValueError:
-            messagebox.showerror("Error", "Age must be a valid number")
-            return False
-        
-        try:
-            years_code = float(self.years_code_entry.get())
-            years_pro = float(self.years_pro_entry.get())
-            if years_pro > years_code:
-                messagebox.showerror("Error", "Professional experience cannot exceed total coding experience")
-                return False
-        except ValueError:
-            messagebox.showerror("Error", "Experience years must be valid numbers")
-            return False
-        
-        try:
-            salary = float(self.salary_entry.get())
-        except ValueError:
-            messagebox.showerror("Error", "Salary must be a valid number")
-            return False
-        
-        username = self.username_entry.get().strip().lower()
-        if username in credentials:
-            messagebox.showerror("Error", "Username already exists. Please choose a different one.")
+        error = validate_application(self.form_fields(), credentials)
+        if error is not None:
+            messagebox.showerror("Error", error)
             return False
-        
         return True
     
     def submit_application(self):
@@ -432,18 +513,23 @@ class RegistrationPage:
             'ApplicationDate': datetime.now().strftime("%Y-%m-%d")
         }
         
-        global df, model, priority_queue
-        df = pd.concat([df, pd.DataFrame([new_user])], ignore_index=True)
-        df['PriorityScore'] = df.apply(calculate_priority, axis=1)
+        # Scoring and writing happen on a worker; the form stays responsive meanwhile
+        self.submit_button.config(state=tk.DISABLED)
+        self.runner.submit(lambda: register_candidate(new_user),
+                           on_done=lambda result: self.application_saved(new_user, *result),
+                           on_error=self.application_failed,
+                           description="Scoring and saving your application...")
+    
+    def application_saved(self, new_user, new_label, priority_score):
         credentials[new_user['Username']] = new_user['Password']
-        save_dataset(df)
-        
-        # Add to priority queue
-        priority_queue.add_candidate(new_user)
         
         messagebox.showinfo("Success", "Application submitted successfully!\n"
                           f"Your password is: {new_user['Password']}")
-        self.back_to_login()
+        self.root.after_idle(self.back_to_login)
+    
+    def application_failed(self, error):
+        self.submit_button.config(state=tk.NORMAL)
+        messagebox.showerror("Error", f"Could not save your application: {error}")
     
     def back_to_login(self):
         self.root.destroy()
@@ -457,6 +543,7 @@ class AdminDashboard:
         self.root.title("Recruiter Dashboard")
         self.root.geometry("1200x800")
         self.root.configure(bg=BG_COLOR)
+        self.review_windows = []
         
         self.title_font = ("Arial", 20, "bold")
         self.label_font = ("Arial", 12)
@@ -480,7 +567,8 @@ class AdminDashboard:
                                font=self.label_font, bg=ENTRY_BG, fg=TEXT_COLOR, 
                                relief=tk.FLAT, width=30)
         search_entry.pack(side=tk.LEFT, padx=5)
-        search_entry.bind("<KeyRelease>", self.filter_candidates)
+        search_entry.bind("<KeyRelease>", self.schedule_search)
+        self.search_after_id = None
         
         tk.Label(filter_frame, text="Status:", font=self.label_font, 
                 bg=BG_COLOR, fg=TEXT_COLOR).pack(side=tk.LEFT, padx=10)
@@ -503,23 +591,12 @@ class AdminDashboard:
         tree_frame = tk.Frame(main_frame, bg=BG_COLOR)
         tree_frame.pack(expand=True, fill=tk.BOTH, pady=10)
         
-        self.tree_scroll = tk.Scrollbar(tree_frame)
-        self.tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.candidate_tree = ttk.Treeview(
-            tree_frame, yscrollcommand=self.tree_scroll.set, 
-            selectmode="browse", columns=("Name", "Age", "Job Role", "Experience", "Status", "Priority"), 
-            show="headings")
-        
-        self.tree_scroll.config(command=self.candidate_tree.yview)
-        
-        for col, width in [("Name", 200), ("Age", 60), ("Job Role", 150), 
-                          ("Experience", 100), ("Status", 100), ("Priority", 80)]:
-            self.candidate_tree.column(col, width=width, anchor=tk.CENTER)
-            self.candidate_tree.heading(col, text=col)
-        
+        # Only the rows in view exist as Treeview items; scrolling reads the next ones from the ranking
+        self.candidate_tree = VirtualTreeview(
+            tree_frame, [("Name", 200), ("Age", 60), ("Job Role", 150), 
+                         ("Experience", 100), ("Status", 100), ("Priority", 80)], 
+            self.candidate_rows, selectmode="extended")
         self.populate_treeview()
-        self.candidate_tree.pack(expand=True, fill=tk.BOTH)
         
         button_frame = tk.Frame(main_frame, bg=BG_COLOR)
         button_frame.pack(pady=10)
@@ -528,6 +605,8 @@ class AdminDashboard:
             ("View Details", self.view_details),
             ("Approve", lambda: self.update_status("Approved")),
             ("Reject", lambda: self.update_status("Rejected")),
+            ("Reject Below Score...", self.reject_below_score),
+            ("Review Next", lambda: ReviewWindow(self)),
             ("Logout", self.logout)
         ]
         
@@ -536,28 +615,34 @@ class AdminDashboard:
             tk.Button(button_frame, text=text, command=cmd, 
                      font=self.label_font, bg=color, fg="white", 
                      relief=tk.FLAT, bd=0, padx=15, pady=5).pack(side=tk.LEFT, padx=5)
+        
+        progress = ttk.Progressbar(button_frame, mode="indeterminate", length=120)
+        progress.pack(side=tk.LEFT, padx=10)
+        status_label = tk.Label(button_frame, text="", font=self.small_font, bg=BG_COLOR, fg=TEXT_COLOR)
+        status_label.pack(side=tk.LEFT)
+        self.runner = TaskRunner(root, progress, status_label)
+    
+    def populate_treeview(self, status_filter="All", jobrole_filter="All", search_text="", keep_position=False):
+        # The ranking index hands back the best rows directly instead of sorting the table
+        ranked = ranking.ranked(
+            status=None if status_filter == "All" else status_filter,
+            job_role=None if jobrole_filter == "All" else jobrole_filter,
+            within=search_index.search(search_text) if search_text else None)
+        self.candidate_tree.set_source(ranked, keep_position)
     
-    def populate_treeview(self, status_filter="All", jobrole_filter="All", search_text=""):
-        self.candidate_tree.delete(*self.candidate_tree.get_children())
-        filtered_df = df.sort_values('PriorityScore', ascending=False)
-        
-        if status_filter != "All":
-            filtered_df = filtered_df[filtered_df['Status'] == status_filter]
-        if jobrole_filter != "All":
-            filtered_df = filtered_df[filtered_df['JobRole'] == jobrole_filter]
-        if search_text:
-            search_text = search_text.lower()
-            filtered_df = filtered_df[filtered_df['Name'].str.lower().str.contains(search_text) | 
-                                     filtered_df['JobRole'].str.lower().str.contains(search_text) |
-                                     filtered_df['Country'].str.lower().str.contains(search_text)]
-        
-        for _, row in filtered_df.iterrows():
-            self.candidate_tree.insert("", tk.END, 
-                values=(row['Name'], row['Age'], row['JobRole'], 
-                       f"{row['YearsCodePro']} yrs", row['Status'], 
-                       row['PriorityScore']))
+    def candidate_rows(self, labels):
+        rows = read_candidates(labels, ['Name', 'Age', 'JobRole', 'YearsCodePro', 'Status', 'PriorityScore'])
+        return [(name, age, job_role, f"{years_pro} yrs", status, score)
+                for _, name, age, job_role, years_pro, status, score in rows.itertuples()]
+    
+    def schedule_search(self, event=None):
+        # Typing a name fires a key release per character; only filter once typing pauses
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.filter_candidates)
     
     def filter_candidates(self, event=None):
+        self.search_after_id = None
         self.populate_treeview(
             self.status_var.get(), 
             self.jobrole_var.get(),
@@ -565,20 +650,22 @@ class AdminDashboard:
         )
     
     def get_selected_candidate(self):
-        try:
-            selected_item = self.candidate_tree.selection()[0]
-            name = self.candidate_tree.item(selected_item)['values'][0]
-            return df[df['Name'] == name].index[0]
-        except:
+        selected = self.get_selected_candidates()
+        return selected[0] if selected else None
+    
+    def get_selected_candidates(self):
+        # Treeview item ids are the candidates' CandidateIds
+        selected = [int(iid) for iid in self.candidate_tree.selection()]
+        if not selected:
             messagebox.showwarning("Warning", "Please select a candidate first")
-            return None
+        return selected
     
     def view_details(self):
         selected_index = self.get_selected_candidate()
         if selected_index is None:
             return
         
-        candidate = df.iloc[selected_index]
+        candidate = read_candidates([selected_index]).iloc[0]
         details_window = tk.Toplevel(self.root)
         details_window.title("Candidate Details")
         details_window.geometry("700x500")
@@ -644,18 +731,58 @@ class AdminDashboard:
                 font=self.label_font, bg=BG_COLOR, fg=TEXT_COLOR).pack(anchor="w")
     
     def update_status(self, new_status):
-        selected_index = self.get_selected_candidate()
-        if selected_index is None:
-            return
-        
-        df.at[selected_index, 'Status'] = new_status
-        if new_status == "Rejected":
-            candidate_data = df.iloc[selected_index]
-            ai_feedback = generate_ai_feedback(candidate_data)
-            df.at[selected_index, 'Feedback'] = ai_feedback
-        
-        save_dataset(df)
-        self.populate_treeview(self.status_var.get(), self.jobrole_var.get())
+        selected = self.get_selected_candidates()
+        if selected:
+            self.apply_status(selected, new_status)
+    
+    def apply_status(self, labels, new_status):
+        # Feedback generation and the single write run on a worker thread
+        self.runner.submit(lambda: change_statuses(labels, new_status),
+                           on_done=lambda labels: self.status_updated(new_status, len(labels)),
+                           on_error=lambda error: messagebox.showerror("Error", f"Could not update status: {error}"),
+                           description=f"Saving {new_status.lower()} status for {len(labels)} candidate(s)...")
+    
+    def reject_below_score(self):
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Reject Below Score")
+        dialog.geometry("420x220")
+        dialog.configure(bg=BG_COLOR)
+        
+        tk.Label(dialog, text="Reject all Pending candidates for", font=self.label_font, 
+                bg=BG_COLOR, fg=TEXT_COLOR).pack(pady=(15, 5))
+        role_var = tk.StringVar(value=self.jobrole_var.get())
+        ttk.Combobox(dialog, textvariable=role_var, values=["All"] + JOB_ROLES, 
+                    font=self.label_font, state="readonly", width=20).pack()
+        tk.Label(dialog, text="with a priority score below", font=self.label_font, 
+                bg=BG_COLOR, fg=TEXT_COLOR).pack(pady=5)
+        score_var = tk.StringVar()
+        tk.Entry(dialog, textvariable=score_var, font=self.label_font, 
+                bg=ENTRY_BG, fg=TEXT_COLOR, relief=tk.FLAT, width=10).pack()
+        
+        def submit():
+            try:
+                threshold = float(score_var.get())
+            except ValueError:
+                messagebox.showerror("Error", "Please enter a numeric score", parent=dialog)
+                return
+            role = role_var.get()
+            labels = ranking.below(threshold, status="Pending", job_role=None if role == "All" else role)
+            if not labels:
+                messagebox.showinfo("Reject Below Score", "No Pending candidates match", parent=dialog)
+                return
+            if messagebox.askyesno("Confirm", f"Reject {len(labels)} Pending candidate(s) "
+                                              f"scoring below {threshold:g}?", parent=dialog):
+                dialog.destroy()
+                self.apply_status(labels, "Rejected")
+        
+        tk.Button(dialog, text="Reject", command=submit, font=self.label_font, 
+                 bg=ERROR_COLOR, fg="white", relief=tk.FLAT).pack(pady=15)
+    
+    def status_updated(self, new_status, count=1):
+        # One refresh for the whole batch
+        self.candidate_tree.clear_selection()
+        self.populate_treeview(self.status_var.get(), self.jobrole_var.get(),
+                               self.search_var.get(), keep_position=True)
         
         popup = tk.Toplevel(self.root)
         popup.title("Status Updated")
@@ -663,22 +790,140 @@ class AdminDashboard:
         popup.configure(bg=BG_COLOR)
         
         color = ACCENT_COLOR if new_status == "Approved" else ERROR_COLOR
-        tk.Label(popup, text=new_status.upper() + "!", 
+        text = new_status.upper() + "!" if count == 1 else f"{count} {new_status.upper()}"
+        tk.Label(popup, text=text, 
                 font=("Arial", 36), bg=BG_COLOR, fg=color).pack(expand=True)
         tk.Button(popup, text="OK", command=popup.destroy, 
                  font=self.label_font, bg=BUTTON_COLOR, fg="white").pack(pady=10)
     
     def logout(self):
+        # Open reviews hand their candidates back first, so the saved queues still hold them
+        for review in list(self.review_windows):
+            review.close()
+        shards.save_snapshots()
         self.root.destroy()
         root = tk.Tk()
         LoginPage(root)
         root.mainloop()
 
+class ReviewWindow:
+    """Walks the Pending candidates one at a time in priority order, taken from the priority queue"""
+    def __init__(self, dashboard):
+        self.dashboard = dashboard
+        # A recruiter filtering on one role only reviews, and only loads, that role's queue
+        role = dashboard.jobrole_var.get()
+        self.job_role = None if role == "All" else role
+        self.current = None
+        self.skipped = []
+        
+        self.window = tk.Toplevel(dashboard.root)
+        self.window.title("Review Next" if self.job_role is None else f"Review Next - {self.job_role}")
+        self.window.geometry("500x400")
+        self.window.configure(bg=BG_COLOR)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        # However the window goes, its candidates go back to the queue
+        self.window.bind("<Destroy>", self.destroyed)
+        dashboard.review_windows.append(self)
+        
+        self.details_frame = tk.Frame(self.window, bg=BG_COLOR)
+        self.details_frame.pack(expand=True, fill=tk.BOTH, padx=20, pady=10)
+        
+        button_frame = tk.Frame(self.window, bg=BG_COLOR)
+        button_frame.pack(pady=10)
+        self.decision_buttons = []
+        for text, cmd, color in [("Approve", lambda: self.decide("Approved"), BUTTON_COLOR),
+                                 ("Reject", lambda: self.decide("Rejected"), ERROR_COLOR),
+                                 ("Skip", self.skip, BUTTON_COLOR)]:
+            button = tk.Button(button_frame, text=text, command=cmd, font=dashboard.label_font, 
+                              bg=color, fg="white", relief=tk.FLAT, bd=0, padx=15, pady=5)
+            button.pack(side=tk.LEFT, padx=5)
+            self.decision_buttons.append(button)
+        tk.Button(button_frame, text="Close", command=self.close, font=dashboard.label_font, 
+                 bg=ERROR_COLOR, fg="white", relief=tk.FLAT, bd=0, padx=15, pady=5).pack(side=tk.LEFT, padx=5)
+        self.show_next()
+    
+    def show_next(self):
+        self.current = shards.next_candidate(self.job_role)
+        for widget in self.details_frame.winfo_children():
+            widget.destroy()
+        
+        if self.current is None:
+            tk.Label(self.details_frame, text="No Pending candidates left to review", 
+                    font=self.dashboard.label_font, bg=BG_COLOR, fg=TEXT_COLOR).pack(expand=True)
+            self.set_buttons(tk.DISABLED)
+            return
+        
+        tk.Label(self.details_frame, text=self.current['Name'], 
+                font=self.dashboard.title_font, bg=BG_COLOR, fg=HEADER_COLOR).pack(anchor="w", pady=5)
+        lines = [
+            f"Priority: {self.current['PriorityScore']}/150",
+            f"Job Role: {self.current['JobRole']}",
+            f"Education: {self.current['EdLevel']}",
+            f"Professional Exp: {self.current['YearsCodePro']} yrs",
+            f"Skills: {self.current['HaveWorkedWith']}",
+            f"Computer Skills: {self.current['ComputerSkills']}/10"
+        ]
+        for line in lines:
+            tk.Label(self.details_frame, text=line, font=self.dashboard.label_font, 
+                    bg=BG_COLOR, fg=TEXT_COLOR, anchor="w").pack(fill=tk.X, pady=3)
+        self.set_buttons(tk.NORMAL)
+    
+    def set_buttons(self, state):
+        for button in self.decision_buttons:
+            button.config(state=state)
+    
+    def decide(self, new_status):
+        label, self.current = self.current[ID_COLUMN], None
+        self.set_buttons(tk.DISABLED)
+        self.dashboard.runner.submit(lambda: change_statuses([label], new_status),
+                                     on_done=self.decided,
+                                     on_error=lambda error: self.failed(label, error),
+                                     description=f"Saving {new_status.lower()} status...")
+    
+    def failed(self, label, error):
+        # The candidate is still Pending; give them back to the queue
+        requeue_candidates([label])
+        messagebox.showerror("Error", f"Could not update status: {error}")
+        if self.window.winfo_exists():
+            self.show_next()
+    
+    def decided(self, labels):
+        dashboard = self.dashboard
+        dashboard.populate_treeview(dashboard.status_var.get(), dashboard.jobrole_var.get(),
+                                    dashboard.search_var.get(), keep_position=True)
+        if self.window.winfo_exists():
+            self.show_next()
+    
+    def skip(self):
+        # Skipped candidates stay out of the queue until the review ends
+        self.skipped.append(self.current[ID_COLUMN])
+        self.show_next()
+    
+    def close(self):
+        self.window.destroy()
+    
+    def destroyed(self, event):
+        # Children's Destroy events reach the window's bindings too
+        if event.widget is not self.window or self not in self.dashboard.review_windows:
+            return
+        self.dashboard.review_windows.remove(self)
+        if self.current is not None:
+            self.skipped.append(self.current[ID_COLUMN])
+            self.current = None
+        if self.skipped:
+            requeue_candidates(self.skipped)
+            self.skipped = []
+
 class UserDashboard:
     def __init__(self, root, username):
         self.root = root
         self.username = username
-        self.user_data = df[df['Username'] == username].iloc[0]
+        from storage import get_store
+        from dataset import dataset_lock, get_dataset
+        with dataset_lock:
+            # Merges any applications still waiting outside the table, this user's included
+            get_dataset()
+            self.user_data = get_store(CSV_FILE).find_by_username(username)
         
         self.root.title("User Dashboard")
         self.root.geometry("800x700")  # Increased height to accommodate feedback
@@ -786,6 +1031,8 @@ class UserDashboard:
         main_canvas.yview_moveto(0)
     
     def show_priority_score(self, parent, score):
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
         fig, ax = plt.subplots(figsize=(4, 4), facecolor=BG_COLOR)
         wedge, _ = ax.pie([score, 150-score], 
                          colors=[self.get_score_color(score), "#f0f0f0"], 
@@ -814,6 +1061,9 @@ class UserDashboard:
 
 # ====================== MAIN EXECUTION ======================
 if __name__ == "__main__":
+    start_loading_resources()
     root = tk.Tk()
     LoginPage(root)
+    root.update_idletasks()
+    startup_timings['first_window'] = time.perf_counter() - _process_start
     root.mainloop()
\ No newline at end of file
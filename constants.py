@@ -0,0 +1,10 @@
+# Shared constants kept free of heavy imports so the GUI can load them instantly
+
+# ====================== CONSTANTS ======================
+CSV_FILE = "job_descriptions.csv"
+JOB_ROLES = ["Web Developer", "Project Manager", "Business Analyst", "HR Specialist",
+             "Data Scientist", "UX Designer", "DevOps Engineer", "Marketing Manager",
+             "Financial Analyst", "Sales Executive"]
+STATUSES = ["Pending", "Approved", "Rejected"]
+# Persistent unique candidate id; also the index of the in-memory candidate table
+ID_COLUMN = "CandidateId"
@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+import threading
+from datetime import datetime
+from pandas.api.types import union_categoricals
+from storage import get_store, assign_candidate_ids, READ_CHUNK_ROWS
+from constants import CSV_FILE, JOB_ROLES, STATUSES, ID_COLUMN
+
+try:
+    # Arrow-backed strings need pyarrow; pandas raises ImportError without it
+    TEXT_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    TEXT_DTYPE = object
+
+# ====================== SCHEMA ======================
+COLUMNS = [ID_COLUMN, 'Name', 'Age', 'Gender', 'EdLevel', 'YearsCode', 'YearsCodePro',
+           'Country', 'PreviousSalary', 'HaveWorkedWith', 'ComputerSkills',
+           'MentalHealth', 'Employed', 'JobRole', 'Username', 'Password',
+           'Status', 'Feedback', 'ApplicationDate', 'PriorityScore']
+
+# Column -> (dtype, default for missing values); the narrowest dtype that fits the form's ranges
+NUMERIC_COLUMNS = {
+    'Age': ('int16', 0),
+    'YearsCode': ('float32', 0.0),
+    'YearsCodePro': ('float32', 0.0),
+    'PreviousSalary': ('float32', 0.0),
+    'ComputerSkills': ('int8', 0),
+    'Employed': ('int8', 0),
+    'PriorityScore': ('float32', None),  # missing scores are filled in by the model
+}
+
+# Column -> (known values, default for missing values)
+CATEGORICAL_COLUMNS = {
+    'Gender': (["Male", "Female", "Other"], ""),
+    'EdLevel': (["High School", "Bachelor", "Master", "PhD"], ""),
+    'MentalHealth': (["Good", "Fair", "Poor"], "Fair"),
+    'JobRole': (JOB_ROLES, ""),
+    'Status': (STATUSES, "Pending"),
+    # Free text, but with few distinct values across applicants
+    'Country': ([], ""),
+    'HaveWorkedWith': ([], ""),
+    'ApplicationDate': ([], ""),
+}
+
+TEXT_COLUMNS = ['Name', 'Username', 'Password', 'Feedback']
+
+def _cast_column(df, col):
+    # Adds the column with its default when it is missing
+    if col in TEXT_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+        df[col] = df[col].astype(object).where(df[col].notna(), "").astype(TEXT_DTYPE)
+    elif col in NUMERIC_COLUMNS:
+        dtype, default = NUMERIC_COLUMNS[col]
+        if col not in df.columns:
+            df[col] = default
+        values = pd.to_numeric(df[col], errors='coerce')
+        if default is not None:
+            values = values.fillna(default)
+        df[col] = values.astype(dtype)
+    elif col in CATEGORICAL_COLUMNS:
+        known, default = CATEGORICAL_COLUMNS[col]
+        if col not in df.columns:
+            df[col] = default
+        values = df[col].astype(object).where(df[col].notna(), default).astype(str)
+        categories = list(dict.fromkeys(known + [default] + sorted(values.unique())))
+        df[col] = pd.Categorical(values, categories=categories)
+
+def apply_schema(df):
+    """Add any missing columns and cast known columns to their schema dtypes, in place"""
+    assign_candidate_ids(df)
+    if 'ApplicationDate' not in df.columns:
+        df['ApplicationDate'] = datetime.now().strftime("%Y-%m-%d")
+    for col in TEXT_COLUMNS + list(NUMERIC_COLUMNS) + list(CATEGORICAL_COLUMNS):
+        _cast_column(df, col)
+    return df
+
+def _union_categories(frames):
+    # Every frame needs identical categories or concat falls back to object columns
+    for col in CATEGORICAL_COLUMNS:
+        categories = frames[0][col].cat.categories
+        for frame in frames[1:]:
+            categories = categories.union(frame[col].cat.categories, sort=False)
+        for frame in frames:
+            if not frame[col].cat.categories.equals(categories):
+                frame[col] = frame[col].cat.set_categories(categories)
+
+def compact_integers(values):
+    """Downcast an integer array (e.g. label-encoded codes) to the smallest integer dtype"""
+    return pd.to_numeric(pd.Series(values), downcast='integer').to_numpy()
+
+def memory_report(df):
+    """Per-column memory use of the candidate table, largest first, with a total row"""
+    usage = df.memory_usage(index=True, deep=True)
+    report = pd.DataFrame({
+        'dtype': [str(df.index.dtype)] + [str(df[col].dtype) for col in df.columns],
+        'bytes': usage.to_numpy(),
+    }, index=usage.index).sort_values('bytes', ascending=False)
+    report.loc['TOTAL'] = ["", int(usage.sum())]
+    report['bytes_per_row'] = report['bytes'] / max(len(df), 1)
+    return report
+
+# ====================== DATABASE FUNCTIONS ======================
+# Held by anything that mutates or persists the shared dataset, since
+# registrations and status changes run on background worker threads.
+dataset_lock = threading.RLock()
+
+def load_dataset(csv_file=CSV_FILE):
+    """Load the candidate table from storage and validate it against the schema"""
+    return apply_schema(get_store(csv_file).load(COLUMNS))
+
+def save_dataset(df):
+    with dataset_lock:
+        get_store(CSV_FILE).save(df)
+
+def append_candidates(df, labels):
+    with dataset_lock:
+        store = get_store(CSV_FILE)
+        if store.needs_rewrite(df):
+            # Rewriting storage takes the whole table, not just the new rows in df
+            df = get_dataset()
+        store.append(df, labels)
+
+def record_changes(df, labels, columns):
+    with dataset_lock:
+        get_store(CSV_FILE).update(df, labels, columns)
+
+def storage_version():
+    """Stamp of the stored dataset that changes with every write, for checking saved derived data"""
+    with dataset_lock:
+        return get_store(CSV_FILE).version()
+
+# ====================== STREAMING ======================
+def iter_dataset(columns, chunk_size=READ_CHUNK_ROWS, csv_file=CSV_FILE):
+    """Yield the candidate table in chunks holding only the given columns, cast to the schema"""
+    # For consumers that need a few fields of every row: the other columns, and
+    # above all the free-text Feedback, are never read into memory
+    for chunk in get_store(csv_file).read_chunks(columns, chunk_size):
+        for col in columns:
+            _cast_column(chunk, col)
+        yield chunk[list(columns)]
+
+def load_columns(columns, chunk_size=READ_CHUNK_ROWS, csv_file=CSV_FILE):
+    """The given columns of the whole candidate table, read chunk by chunk"""
+    chunks = list(iter_dataset(columns, chunk_size, csv_file))
+    if not chunks:
+        return apply_schema(pd.DataFrame(columns=[ID_COLUMN] + list(columns)))[list(columns)]
+    # Each chunk has its own categories; merge them so the result stays categorical
+    frame = pd.concat([chunk.drop(columns=[col for col in columns if col in CATEGORICAL_COLUMNS])
+                       for chunk in chunks])
+    for col in columns:
+        if col in CATEGORICAL_COLUMNS:
+            frame[col] = union_categoricals([chunk[col].array for chunk in chunks])
+    return frame[list(columns)]
+
+def load_credentials(csv_file=CSV_FILE):
+    """Username -> password for every candidate, without loading the rest of the table"""
+    credentials = {}
+    for chunk in iter_dataset(['Username', 'Password'], csv_file=csv_file):
+        names = chunk['Username'].astype(object).str.strip().str.lower()
+        # The first row with a username owns it, as in the store's own lookups
+        keep = (names != "") & ~names.duplicated() & ~names.isin(credentials)
+        credentials.update(zip(names[keep], chunk['Password'][keep].astype(object)))
+    return credentials
+
+# ====================== SHARED DATASET ======================
+# Registrations wait in a side table and join the shared table in batches, so a
+# new candidate does not copy the whole table. Reading the table merges them first.
+MERGE_EVERY = 1000
+_dataset = None
+_new_rows = []  # frames of candidates added since the last merge, oldest first
+
+def _merge_new_rows():
+    global _dataset
+    frames = [_dataset] + _new_rows
+    _union_categories(frames)
+    _dataset = pd.concat(frames)
+    _new_rows.clear()
+    get_store(CSV_FILE).track(_dataset)
+
+def get_dataset():
+    """Return the one in-memory candidate table shared by the GUI and the priority system"""
+    global _dataset
+    with dataset_lock:
+        if _dataset is None:
+            _dataset = load_dataset()
+        if _new_rows:
+            _merge_new_rows()
+        return _dataset
+
+def add_candidates(records):
+    """Add candidate dicts to the shared dataset; returns their rows, indexed by new CandidateIds"""
+    # The returned frame is the one waiting to be merged, so values set in it
+    # (a score, say) are kept for as long as is_buffered() says it is waiting
+    with dataset_lock:
+        if _dataset is None:
+            get_dataset()
+        last = _new_rows[-1] if _new_rows else _dataset
+        next_id = int(last.index.max()) + 1 if len(last) else 0
+        new_rows = pd.DataFrame(records)
+        new_rows[ID_COLUMN] = np.arange(next_id, next_id + len(new_rows))
+        apply_schema(new_rows)
+        # Same columns as the table, in the same order, so the rows can be appended to storage alone
+        new_rows = new_rows.reindex(columns=_dataset.columns.union(new_rows.columns, sort=False))
+        _new_rows.append(new_rows)
+        if sum(len(rows) for rows in _new_rows) >= MERGE_EVERY:
+            _merge_new_rows()
+        return new_rows
+
+def is_buffered(rows):
+    """Whether a frame returned by add_candidates is still waiting to join the shared table"""
+    with dataset_lock:
+        return any(rows is new_rows for new_rows in _new_rows)
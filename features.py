@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from skills import candidate_skills, has_skills, tokenize_skills
+
+# ====================== CONSTANTS ======================
+FEATURE_COLUMNS = ['Age', 'Gender', 'EdLevel', 'YearsCode', 'YearsCodePro',
+                   'ComputerSkills', 'MentalHealth', 'Employed', 'JobRole']
+NUMERIC_FEATURES = ['Age', 'YearsCode', 'YearsCodePro', 'ComputerSkills', 'Employed']
+CATEGORICAL_FEATURES = [col for col in FEATURE_COLUMNS if col not in NUMERIC_FEATURES]
+# Each skill in HaveWorkedWith listed by at least MIN_SKILL_ROWS training rows gets a feature
+SKILL_PREFIX = 'Skill_'
+MIN_SKILL_ROWS = 5
+
+# ====================== FEATURE ENCODER ======================
+def _to_float(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if np.isnan(value) else value
+
+def prepare_features(df):
+    """Select the model's feature columns with numeric fields coerced to floats"""
+    features = df[FEATURE_COLUMNS].copy()
+    for col in NUMERIC_FEATURES:
+        features[col] = pd.to_numeric(features[col], errors='coerce').fillna(0).astype(float)
+    return features
+
+class FeatureEncoder:
+    """Frozen one-hot schema that maps candidates straight to the model's feature vector"""
+    def __init__(self, feature_names):
+        self.feature_names = list(feature_names)
+        self.numeric_index = {}
+        self.category_index = {col: {} for col in CATEGORICAL_FEATURES}
+        self.skill_index = {}
+        
+        for position, name in enumerate(self.feature_names):
+            if name in NUMERIC_FEATURES:
+                self.numeric_index[name] = position
+                continue
+            if name.startswith(SKILL_PREFIX):
+                self.skill_index[name[len(SKILL_PREFIX):]] = position
+                continue
+            for col in CATEGORICAL_FEATURES:
+                if name.startswith(col + '_'):
+                    self.category_index[col][name[len(col) + 1:]] = position
+                    break
+    
+    def __setstate__(self, state):
+        # Encoders saved before skill features existed have none
+        state.setdefault('skill_index', {})
+        self.__dict__.update(state)
+    
+    @classmethod
+    def fit(cls, df):
+        """Freeze the columns pd.get_dummies produces for the training frame, plus its common skills"""
+        present, vocabulary = candidate_skills(df)
+        counts = np.bincount(present.indices, minlength=present.shape[1])
+        common = [vocabulary.names[i] for i in np.flatnonzero(counts >= MIN_SKILL_ROWS)]
+        return cls(list(pd.get_dummies(prepare_features(df)).columns) +
+                   [SKILL_PREFIX + skill for skill in sorted(common)])
+    
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+    
+    def transform_one(self, candidate_data):
+        """Encode one candidate dict without touching the rest of the dataset"""
+        vector = np.zeros(self.n_features)
+        for col, position in self.numeric_index.items():
+            vector[position] = _to_float(candidate_data.get(col, 0))
+        for col, positions in self.category_index.items():
+            position = positions.get(str(candidate_data.get(col)))
+            if position is not None:
+                vector[position] = 1.0
+        for skill in tokenize_skills(candidate_data.get('HaveWorkedWith')):
+            position = self.skill_index.get(skill)
+            if position is not None:
+                vector[position] = 1.0
+        return vector
+    
+    def transform(self, df, skills=None):
+        """Encode a whole frame into an (n_rows, n_features) array; skills is the shared SkillMatrix"""
+        features = prepare_features(df)
+        X = np.zeros((len(features), self.n_features))
+        for col, position in self.numeric_index.items():
+            X[:, position] = features[col].to_numpy()
+        
+        rows = np.arange(len(features))
+        for col, positions in self.category_index.items():
+            codes = features[col].astype(str).map(positions)
+            hit = codes.notna().to_numpy()
+            X[rows[hit], codes[hit].to_numpy(dtype=int)] = 1.0
+        
+        if self.skill_index:
+            present, vocabulary = candidate_skills(df, skills)
+            X[:, list(self.skill_index.values())] = has_skills(present, vocabulary, list(self.skill_index))
+        return X
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from skills import candidate_skills, has_skills
+
+# ====================== CONSTANTS ======================
+ROLE_REQUIREMENTS = {
+    "Data Scientist": ["Python", "SQL", "Machine Learning", "Statistics", "Data Analysis"],
+    "Web Developer": ["JavaScript", "HTML/CSS", "React", "Node.js", "Frontend"],
+    "DevOps Engineer": ["Docker", "Kubernetes", "AWS", "CI/CD", "Infrastructure"],
+    "Project Manager": ["Leadership", "Agile", "Scrum", "Communication", "Planning"],
+    "Business Analyst": ["SQL", "Excel", "Requirements", "Documentation", "Analysis"],
+    "UX Designer": ["Figma", "User Research", "Wireframing", "Prototyping", "UI/UX"],
+    "Marketing Manager": ["SEO", "Content", "Social Media", "Advertising", "Branding"],
+    "Financial Analyst": ["Excel", "Financial Modeling", "Accounting", "Forecasting", "Analysis"],
+    "Sales Executive": ["CRM", "Negotiation", "Communication", "Relationship", "Sales"],
+    "HR Specialist": ["Recruitment", "Employee Relations", "HR Policies", "Interviewing", "Compliance"]
+}
+
+AVERAGE_SALARIES = {
+    "Data Scientist": 120000, "Web Developer": 85000, "DevOps Engineer": 110000,
+    "Project Manager": 95000, "Business Analyst": 80000, "UX Designer": 75000,
+    "Financial Analyst": 90000, "Marketing Manager": 80000, "Sales Executive": 70000,
+    "HR Specialist": 65000
+}
+
+# Roles where a Bachelor's degree gets the further-study suggestion
+ADVANCED_DEGREE_ROLES = ["Data Scientist", "DevOps Engineer"]
+
+NO_FEEDBACK = ("No specific feedback available. Your profile looks good overall, "
+               "but the competition was particularly strong for this role.")
+
+ROLES = list(ROLE_REQUIREMENTS)
+
+# ====================== HELPERS ======================
+def _column(candidates, col, default):
+    if col in candidates.columns:
+        return candidates[col]
+    return pd.Series(default, index=candidates.index)
+
+def _numbers(candidates, col):
+    """Floats for the rule comparisons, and the values as the messages should show them"""
+    values = pd.to_numeric(_column(candidates, col, 0), errors='coerce').to_numpy()
+    if values.dtype == np.float32:
+        # Through text, so a stored 2.3 shows as 2.3 rather than as its float32 value 2.299999952316284
+        values = values.astype(str).astype('float64')
+    return values.astype('float64'), np.array(values.tolist(), dtype=object)
+
+def _missing_skill_messages(role_codes, present, vocabulary):
+    messages = _no_messages(len(role_codes))
+    for role, required in enumerate(ROLE_REQUIREMENTS.values()):
+        rows = np.flatnonzero(role_codes == role)
+        if not len(rows):
+            continue
+        # Rows of a role missing the same skills share a message; render each gap pattern once
+        has = has_skills(present[rows], vocabulary, required)
+        patterns = has.astype(np.int64) @ (1 << np.arange(len(required)))
+        for pattern in np.unique(patterns).tolist():
+            missing = [skill for i, skill in enumerate(required) if not pattern >> i & 1]
+            if missing:
+                messages[rows[patterns == pattern]] = (
+                    f"For {ROLES[role]} roles, we recommend gaining experience with: {', '.join(missing)}")
+    return messages
+
+def _no_messages(count):
+    return np.full(count, None, dtype=object)
+
+def _fill(messages, mask, values, template):
+    # Few distinct values need formatting, e.g. years of experience
+    texts = {value: template.format(value) for value in set(values[mask].tolist())}
+    messages[mask] = [texts[value] for value in values[mask].tolist()]
+
+# ====================== FEEDBACK ENGINE ======================
+def generate_feedback(candidates, skills=None):
+    """Rejection feedback for every row of a candidate frame, as a list in row order"""
+    # Every rule is evaluated as a column operation; text is only assembled at the end.
+    # skills is the shared SkillMatrix; without one the frame's skills are tokenized here.
+    if not len(candidates):
+        return []
+    roles = _column(candidates, 'JobRole', "").astype(str).to_numpy()
+    role_codes = pd.Categorical(roles, categories=ROLES).codes.astype(np.int64)
+    education = _column(candidates, 'EdLevel', "").astype(str).to_numpy()
+    mental_health = _column(candidates, 'MentalHealth', "").astype(str).to_numpy()
+    years_pro, shown_years = _numbers(candidates, 'YearsCodePro')
+    computer_skills, shown_skills = _numbers(candidates, 'ComputerSkills')
+
+    present, vocabulary = candidate_skills(candidates, skills)
+    rules = [_missing_skill_messages(role_codes, present, vocabulary)]
+
+    experience = _no_messages(len(candidates))
+    _fill(experience, years_pro < 3, shown_years,
+          "More professional experience would strengthen your application (currently {} years). "
+          "Consider internships or freelance work.")
+    _fill(experience, (years_pro >= 3) & (years_pro < 5), shown_years,
+          "While you have {} years of experience, additional professional experience "
+          "would make you more competitive.")
+    rules.append(experience)
+
+    degree = _no_messages(len(candidates))
+    degree[education == "High School"] = ("Consider pursuing higher education or professional "
+                                          "certifications to be more competitive.")
+    degree[(education == "Bachelor") & np.isin(roles, ADVANCED_DEGREE_ROLES)] = (
+        "For this technical role, a Master's degree or specialized certifications could be beneficial.")
+    rules.append(degree)
+
+    skill_rating = _no_messages(len(candidates))
+    _fill(skill_rating, computer_skills < 5, shown_skills,
+          "Your computer skills rating ({}/10) could be improved through courses or certifications.")
+    _fill(skill_rating, (computer_skills >= 5) & (computer_skills < 8), shown_skills,
+          "Your computer skills are decent ({}/10), but reaching 8+ would make you more competitive.")
+    rules.append(skill_rating)
+
+    wellbeing = _no_messages(len(candidates))
+    wellbeing[mental_health == "Poor"] = ("We noticed you reported poor mental health. "
+                                          "Many companies offer wellness programs that could help.")
+    rules.append(wellbeing)
+
+    if 'PreviousSalary' in candidates.columns:
+        salary, _ = _numbers(candidates, 'PreviousSalary')
+        average = pd.Series(roles).map(AVERAGE_SALARIES).to_numpy(dtype='float64')
+        with np.errstate(invalid='ignore'):
+            ratio = salary / average
+        high = (salary > 0) & (ratio > 1.2)
+        low = (salary > 0) & (ratio < 0.8)
+        pay = _no_messages(len(candidates))
+        pay[high] = [f"Your previous salary (${s:,.0f}) is significantly higher than average for this role (${a:,.0f})."
+                     for s, a in zip(salary[high].tolist(), average[high].tolist())]
+        pay[low] = [f"Your previous salary (${s:,.0f}) is below average for this role (${a:,.0f}), which could work in your favor."
+                    for s, a in zip(salary[low].tolist(), average[low].tolist())]
+        rules.append(pay)
+
+    # Join each row's messages with whole-column string operations
+    body = np.full(len(candidates), "", dtype=object)
+    for messages in rules:
+        has_message = messages != None
+        body[has_message] = body[has_message] + "\n- " + messages[has_message]
+    return np.where(body == "", NO_FEEDBACK, "AI Feedback:" + body).tolist()
+
+def generate_ai_feedback(candidate_data):
+    """Rejection feedback for one candidate given as a dict or Series"""
+    return generate_feedback(pd.DataFrame([dict(candidate_data)]))[0]
@@ -0,0 +1,123 @@
+import heapq
+
+# ====================== INDEXED HEAP ======================
+class IndexedHeap:
+    """Binary min-heap of items by key that can find, re-key and remove any item"""
+    # keys and items are parallel heap arrays and positions maps each item to its
+    # slot, so changing or removing one item sifts from that slot in O(log n).
+    # Only keys are ever compared; items just need to be hashable.
+    def __init__(self):
+        self.keys = []
+        self.items = []
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def key(self, item):
+        return self.keys[self.positions[item]]
+
+    def heapify(self, items, keys):
+        """Replace the contents with the given items and keys in O(n)"""
+        items, keys = list(items), list(keys)
+        positions = {item: i for i, item in enumerate(items)}
+        if len(positions) != len(items) or len(keys) != len(items):
+            raise ValueError("heapify needs one key per item and no repeated items")
+        self.keys, self.items, self.positions = keys, items, positions
+        for i in reversed(range(len(items) // 2)):
+            self._sift_down(i)
+
+    def push(self, item, key):
+        """Insert an item, or re-key it if it is already in the heap"""
+        if item in self.positions:
+            return self.update(item, key)
+        self.positions[item] = len(self.items)
+        self.keys.append(key)
+        self.items.append(item)
+        self._sift_up(len(self.items) - 1)
+
+    def update(self, item, key):
+        """Change an item's key, moving it up (decrease-key) or down as needed"""
+        i = self.positions[item]
+        decreased = key < self.keys[i]
+        self.keys[i] = key
+        if decreased:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def remove(self, item):
+        """Take an item out of the heap and return its key"""
+        i = self.positions.pop(item)
+        key = self.keys[i]
+        last_key, last_item = self.keys.pop(), self.items.pop()
+        if i < len(self.items):
+            # Fill the hole with the last leaf and restore the order around it
+            self.keys[i], self.items[i] = last_key, last_item
+            self.positions[last_item] = i
+            if last_key < key:
+                self._sift_up(i)
+            else:
+                self._sift_down(i)
+        return key
+
+    def discard(self, item):
+        if item in self.positions:
+            self.remove(item)
+
+    def peek(self):
+        """The (item, key) with the smallest key; IndexError when empty"""
+        return self.items[0], self.keys[0]
+
+    def pop(self):
+        item = self.items[0]
+        return item, self.remove(item)
+
+    def top(self, k):
+        """The k smallest (item, key) pairs in order, leaving the heap unchanged"""
+        # Walk the heap best-first: only children of slots already taken can come next
+        found = []
+        frontier = [(self.keys[0], 0)] if self.items else []
+        while frontier and len(found) < k:
+            key, i = heapq.heappop(frontier)
+            found.append((self.items[i], key))
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self.items):
+                    heapq.heappush(frontier, (self.keys[child], child))
+        return found
+
+    def _sift_up(self, i):
+        key, item = self.keys[i], self.items[i]
+        while i > 0:
+            parent = (i - 1) // 2
+            if not key < self.keys[parent]:
+                break
+            self._move(parent, i)
+            i = parent
+        self._place(i, key, item)
+
+    def _sift_down(self, i):
+        key, item = self.keys[i], self.items[i]
+        size = len(self.items)
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and self.keys[child + 1] < self.keys[child]:
+                child += 1
+            if not self.keys[child] < key:
+                break
+            self._move(child, i)
+            i = child
+        self._place(i, key, item)
+
+    def _move(self, source, target):
+        self.keys[target], self.items[target] = self.keys[source], self.items[source]
+        self.positions[self.items[target]] = target
+
+    def _place(self, i, key, item):
+        self.keys[i], self.items[i] = key, item
+        self.positions[item] = i
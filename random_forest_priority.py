@@ -1,173 +1,713 @@
 import pandas as pd
 import os
-from datetime import datetime
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
+from sklearn.metrics import mean_absolute_error, r2_score
 import joblib
-from queue import PriorityQueue
+import pickle
+import argparse
+import copy
+import glob
+import re
+import shutil
+import hashlib
+import itertools
+import threading
+import sys
+import time
+import tracemalloc
+import weakref
+from constants import CSV_FILE, JOB_ROLES
+from dataset import load_columns, get_dataset, dataset_lock
+# FeatureEncoder is defined in features so pickled encoders load from any entry point
+from features import FeatureEncoder, FEATURE_COLUMNS, prepare_features
+from indexed_heap import IndexedHeap
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
 # ====================== CONSTANTS ======================
-CSV_FILE = "job_descriptions.csv"
 MODEL_FILE = "random_forest_model.joblib"
+ENCODER_FILE = "random_forest_encoder.joblib"
+# Everything fitting a model reads; the free-text columns are left out
+TRAINING_COLUMNS = FEATURE_COLUMNS + ['HaveWorkedWith', 'PriorityScore', 'Status']
+N_ESTIMATORS = 100
+MAX_DEPTH = None
+N_JOBS = -1  # train trees on every core
+MODEL_DIR = "models"
+KEEP_MODEL_VERSIONS = 5
+RETRAIN_THRESHOLD = 50  # new Approved/Rejected decisions before retraining
+WARM_START_TREES = 20  # trees added per warm-start round
+MAX_WARM_START_TREES = 300  # past this, do a full refit instead
+# Training target of a decided candidate: the top or bottom of the 0-150 score scale
+DECISION_TARGETS = {"Approved": 150.0, "Rejected": 0.0}
+QUEUE_SNAPSHOT_FILE = "priority_queue.snapshot"
+# Scored rows a role needs before it is given a model of its own
+MIN_SHARD_ROWS = 200
 
-# ====================== DATABASE FUNCTIONS ======================
-def load_dataset(csv_file=CSV_FILE):
-    if not os.path.exists(csv_file):
-        df = pd.DataFrame(columns=['Name', 'Age', 'Gender', 'EdLevel', 'YearsCode', 'YearsCodePro',
-                                 'Country', 'PreviousSalary', 'HaveWorkedWith', 'ComputerSkills',
-                                 'MentalHealth', 'Employed', 'JobRole', 'Username', 'Password',
-                                 'Status', 'Feedback', 'ApplicationDate', 'PriorityScore'])
-        df.to_csv(csv_file, index=False)
-    else:
-        df = pd.read_csv(csv_file)
-    
-    # Ensure all required columns exist
-    for col in ['Name', 'Gender', 'EdLevel', 'Country', 'HaveWorkedWith', 'JobRole']:
-        if col not in df.columns:
-            df[col] = ""
-    
-    for col in ['Age', 'YearsCode', 'YearsCodePro', 'ComputerSkills', 'PreviousSalary', 'PriorityScore']:
-        if col not in df.columns:
-            df[col] = 0
-    
-    if 'Employed' not in df.columns:
-        df['Employed'] = False
-    if 'MentalHealth' not in df.columns:
-        df['MentalHealth'] = "Fair"
-    if 'Username' not in df.columns:
-        df['Username'] = ""
-    if 'Password' not in df.columns:
-        df['Password'] = ""
-    if 'Status' not in df.columns:
-        df['Status'] = "Pending"
-    if 'Feedback' not in df.columns:
-        df['Feedback'] = ""
-    if 'ApplicationDate' not in df.columns:
-        df['ApplicationDate'] = datetime.now().strftime("%Y-%m-%d")
-    
-    return df
+# ====================== FEATURE ENCODER ======================
+_encoder_cache = weakref.WeakKeyDictionary()
+
+def load_feature_encoder(model, encoder_file=ENCODER_FILE):
+    """Load the encoder saved with the model, rebuilding it from the model if it is missing or stale"""
+    encoder = None
+    if os.path.exists(encoder_file):
+        encoder = joblib.load(encoder_file)
+    if encoder is None or encoder.n_features != model.n_features_in_:
+        if not hasattr(model, 'feature_names_in_'):
+            raise ValueError(f"{encoder_file} does not match its model; retrain the model")
+        encoder = FeatureEncoder(model.feature_names_in_)
+    return encoder
 
-def save_dataset(df):
-    df.to_csv(CSV_FILE, index=False)
+def get_feature_encoder(model):
+    """Return the encoder for a model, loading it from disk only once per model object"""
+    encoder = _encoder_cache.get(model)
+    if encoder is None:
+        encoder = load_feature_encoder(model)
+        _encoder_cache[model] = encoder
+    return encoder
 
 # ====================== RANDOM FOREST MODEL FUNCTIONS ======================
-def train_random_forest_model(df):
+def training_targets(df):
+    """Score each row should learn: its recruiter decision if it has one, else its PriorityScore"""
+    # Scores of undecided rows are mostly the model's own predictions; only
+    # decisions tell it something new, so they replace the score outright
+    scores = pd.to_numeric(df['PriorityScore'], errors='coerce')
+    if 'Status' not in df.columns:
+        return scores.to_numpy(dtype=float)
+    decisions = df['Status'].astype(object).map(DECISION_TARGETS)
+    return decisions.fillna(scores).to_numpy(dtype=float)
+
+def fit_random_forest_model(df, n_estimators=N_ESTIMATORS, max_depth=MAX_DEPTH, n_jobs=N_JOBS):
+    """Fit a forest on a train split and return (model, encoder, holdout metrics)"""
+    # Only rows with a decision or a score can be learned from
+    y = training_targets(df)
+    df, y = df[~np.isnan(y)], y[~np.isnan(y)]
+    
     # Prepare the data for training
-    X = pd.get_dummies(df[['Age', 'Gender', 'EdLevel', 'YearsCode', 'YearsCodePro', 
-                          'ComputerSkills', 'MentalHealth', 'Employed', 'JobRole']])
-    y = df['PriorityScore']
+    encoder = FeatureEncoder.fit(df)
+    X = encoder.transform(df)
     
     # Split data into training and testing sets
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
-    # Create and train the Random Forest model
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
+    # Create and train the Random Forest model, building trees in parallel
+    model = RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth,
+                                  n_jobs=n_jobs, random_state=42)
     model.fit(X_train, y_train)
     
-    # Save the trained model
-    joblib.dump(model, MODEL_FILE)
+    # Predicting one candidate at a time is faster without the thread pool
+    model.set_params(n_jobs=None)
     
+    y_pred = model.predict(X_test)
+    metrics = {
+        'train_rows': len(X_train),
+        'test_rows': len(X_test),
+        'r2': r2_score(y_test, y_pred) if len(y_test) > 1 else float('nan'),
+        'mae': mean_absolute_error(y_test, y_pred) if len(y_test) else float('nan'),
+    }
+    return model, encoder, metrics
+
+def _stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+def _model_versions(model_file=MODEL_FILE):
+    versions = []
+    pattern = re.escape(_stem(model_file)) + r"\.v(\d+)\.joblib"
+    for path in glob.glob(os.path.join(MODEL_DIR, glob.escape(_stem(model_file)) + ".v*.joblib")):
+        match = re.fullmatch(pattern, os.path.basename(path))
+        if match:
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+def _versioned_paths(version, model_file=MODEL_FILE, encoder_file=ENCODER_FILE):
+    return (os.path.join(MODEL_DIR, f"{_stem(model_file)}.v{version}.joblib"),
+            os.path.join(MODEL_DIR, f"{_stem(encoder_file)}.v{version}.joblib"))
+
+def role_files(job_role):
+    """(model file, encoder file, queue snapshot file) of one JobRole's shard"""
+    slug = re.sub(r"[^0-9a-z]+", "_", str(job_role).lower()).strip("_")
+    return (f"random_forest_model.{slug}.joblib", f"random_forest_encoder.{slug}.joblib",
+            f"priority_queue.{slug}.snapshot")
+
+def _atomic_copy(source, target):
+    tmp_file = target + ".tmp"
+    shutil.copyfile(source, tmp_file)
+    os.replace(tmp_file, target)
+
+def save_model(model, encoder, registry=None):
+    """Save a new model version with its encoder and atomically make it the registry's active model"""
+    registry = registry or model_registry
+    files = (registry.model_file, registry.encoder_file)
+    os.makedirs(MODEL_DIR, exist_ok=True)
+    versions = _model_versions(registry.model_file)
+    version = versions[-1] + 1 if versions else 1
+    model_path, encoder_path = _versioned_paths(version, *files)
+    joblib.dump(model, model_path)
+    joblib.dump(encoder, encoder_path)
+    
+    # The encoder goes first: the registry reloads when the model file changes
+    _atomic_copy(encoder_path, registry.encoder_file)
+    _atomic_copy(model_path, registry.model_file)
+    _encoder_cache[model] = encoder
+    registry.register(model, encoder)
+    
+    for old_version in versions[:-KEEP_MODEL_VERSIONS + 1]:
+        for path in _versioned_paths(old_version, *files):
+            if os.path.exists(path):
+                os.remove(path)
+    return version
+
+def train_random_forest_model(df, n_estimators=N_ESTIMATORS, max_depth=MAX_DEPTH, n_jobs=N_JOBS):
+    model, encoder, _ = fit_random_forest_model(df, n_estimators, max_depth, n_jobs)
+    save_model(model, encoder)
     return model
 
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where resource is unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+def benchmark_training(df, n_estimators=N_ESTIMATORS, max_depth=MAX_DEPTH, n_jobs=N_JOBS):
+    """Fit a model and report wall time, peak memory and holdout metrics"""
+    # Peak RSS is free to read; tracemalloc is the (slower) fallback where it is unavailable
+    if resource is None:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        model, encoder, metrics = fit_random_forest_model(df, n_estimators, max_depth, n_jobs)
+        wall_seconds = time.perf_counter() - start
+        if resource is None:
+            peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        else:
+            peak_memory_mb = peak_rss_mb()
+    finally:
+        if resource is None:
+            tracemalloc.stop()
+    
+    report = {'n_estimators': n_estimators, 'max_depth': max_depth, 'n_jobs': n_jobs,
+              'wall_seconds': wall_seconds, 'peak_memory_mb': peak_memory_mb}
+    report.update(metrics)
+    return model, encoder, report
+
 def load_or_train_model(df):
-    if os.path.exists(MODEL_FILE):
-        model = joblib.load(MODEL_FILE)
-    else:
+    model, _ = model_registry.get()
+    if model is None:
         model = train_random_forest_model(df)
     return model
 
-def predict_priority_score(candidate_data, model, df):
-    # Create a temporary DataFrame with the candidate's data
-    temp_df = pd.DataFrame([candidate_data])
+# ====================== MODEL REGISTRY ======================
+def _file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ModelRegistry:
+    """Keeps the trained model and its encoder in memory, reloading only when the model file changes"""
+    def __init__(self, model_file=MODEL_FILE, encoder_file=ENCODER_FILE):
+        self.model_file = model_file
+        self.encoder_file = encoder_file
+        self.model = None
+        self.encoder = None
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.last_load_seconds = 0.0
+        self.total_load_seconds = 0.0
+        self._signature = None
+        self._lock = threading.Lock()
     
-    # Ensure all categorical columns are present
-    full_df = pd.concat([df, temp_df], ignore_index=True)
+    def _file_signature(self):
+        stat = os.stat(self.model_file)
+        return stat.st_mtime_ns, stat.st_size
     
-    # Prepare the data for prediction
-    X_pred = pd.get_dummies(full_df[['Age', 'Gender', 'EdLevel', 'YearsCode', 'YearsCodePro', 
-                                   'ComputerSkills', 'MentalHealth', 'Employed', 'JobRole']])
-    X_pred = X_pred.tail(1)  # Get only the last row (our candidate)
+    def get(self):
+        """Return (model, encoder), or (None, None) when no model has been trained yet"""
+        with self._lock:
+            if not os.path.exists(self.model_file):
+                self.misses += 1
+                return None, None
+            
+            signature = self._file_signature()
+            if self.model is not None and signature == self._signature:
+                self.hits += 1
+                return self.model, self.encoder
+            
+            # The file was touched: only reload if its contents actually changed
+            version = _file_digest(self.model_file)
+            if self.model is not None and version == self.version:
+                self._signature = signature
+                self.hits += 1
+                return self.model, self.encoder
+            
+            self.misses += 1
+            start = time.perf_counter()
+            model = joblib.load(self.model_file)
+            encoder = load_feature_encoder(model, self.encoder_file)
+            self.last_load_seconds = time.perf_counter() - start
+            self.total_load_seconds += self.last_load_seconds
+            self.loads += 1
+            
+            _encoder_cache[model] = encoder
+            self.model, self.encoder = model, encoder
+            self.version, self._signature = version, signature
+            return model, encoder
     
-    # Ensure all expected columns are present
-    if os.path.exists(MODEL_FILE):
-        expected_columns = joblib.load(MODEL_FILE).feature_names_in_
-        for col in expected_columns:
-            if col not in X_pred.columns:
-                X_pred[col] = 0
+    def register(self, model, encoder):
+        """Adopt a freshly trained model that has just been written to the model file"""
+        with self._lock:
+            self.model, self.encoder = model, encoder
+            self.version = _file_digest(self.model_file)
+            self._signature = self._file_signature()
     
-        # Reorder columns to match training data
-        X_pred = X_pred[expected_columns]
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'loads': self.loads,
+            'last_load_seconds': self.last_load_seconds,
+            'total_load_seconds': self.total_load_seconds,
+            'version': self.version,
+        }
+
+model_registry = ModelRegistry()
+
+def _predict(model, X, encoder):
+    # Models trained before the encoder existed were fitted on named DataFrame columns
+    if hasattr(model, 'feature_names_in_'):
+        X = pd.DataFrame(X, columns=encoder.feature_names)
+    return model.predict(X)
+
+def predict_priority_scores(df, model, skills=None):
+    """Score every row of a frame with a single encode pass and one model.predict call"""
+    if len(df) == 0:
+        return np.empty(0)
     
-        # Predict the priority score
-        predicted_score = model.predict(X_pred)[0]
+    if model is not None:
+        encoder = get_feature_encoder(model)
+        predicted_scores = _predict(model, encoder.transform(df, skills), encoder)
     else:
         # Fallback to rule-based scoring if model doesn't exist
-        predicted_score = calculate_priority_fallback(candidate_data)
+        predicted_scores = priority_fallback_scores(df)
     
     # Scale to 0-150 range
-    predicted_score = np.clip(predicted_score, 0, 150)
+    return np.clip(predicted_scores, 0, 150)
+
+def predict_priority_score(candidate_data, model, df=None):
+    """Score a single candidate; df is no longer needed and kept for older callers"""
+    if model is None:
+        return calculate_priority_fallback(candidate_data)
     
-    return predicted_score
+    encoder = get_feature_encoder(model)
+    predicted_score = _predict(model, encoder.transform_one(candidate_data).reshape(1, -1), encoder)[0]
+    return np.clip(predicted_score, 0, 150)
+
+FALLBACK_EDUCATION_SCORES = {"PhD": 30, "Master": 20, "Bachelor": 15, "High School": 5}
+FALLBACK_ROLE_WEIGHTS = {
+    "Web Developer": 30, "Data Scientist": 30, "DevOps Engineer": 30,
+    "Project Manager": 25, "Business Analyst": 25, "UX Designer": 20,
+    "Financial Analyst": 20, "Marketing Manager": 15, "Sales Executive": 15,
+    "HR Specialist": 10
+}
+# (lowest age, highest age, points), checked in this order
+FALLBACK_AGE_BANDS = [(25, 35, 20), (36, 45, 15), (18, 24, 10), (46, 55, 5)]
 
 def calculate_priority_fallback(row):
     """Fallback priority calculation if model isn't trained yet"""
     score = 0
-    ed_scores = {"PhD": 30, "Master": 20, "Bachelor": 15, "High School": 5}
-    score += ed_scores.get(row['EdLevel'], 0)
+    score += FALLBACK_EDUCATION_SCORES.get(row['EdLevel'], 0)
     score += min(row['YearsCodePro'] * 4, 40)
     score += min(row['ComputerSkills'] * 2, 20)
     
     age = row['Age']
-    if 25 <= age <= 35: score += 20
-    elif 36 <= age <= 45: score += 15
-    elif 18 <= age <= 24: score += 10
-    elif 46 <= age <= 55: score += 5
-    
-    job_weights = {
-        "Web Developer": 30, "Data Scientist": 30, "DevOps Engineer": 30,
-        "Project Manager": 25, "Business Analyst": 25, "UX Designer": 20,
-        "Financial Analyst": 20, "Marketing Manager": 15, "Sales Executive": 15,
-        "HR Specialist": 10
-    }
-    score += job_weights.get(row['JobRole'], 0)
+    for low, high, points in FALLBACK_AGE_BANDS:
+        if low <= age <= high:
+            score += points
+            break
+    
+    score += FALLBACK_ROLE_WEIGHTS.get(row['JobRole'], 0)
     
     if row['MentalHealth'] == "Good": score += 10
     
     return min(score, 150)
 
+def priority_fallback_scores(df):
+    """calculate_priority_fallback for every row of a frame, as column operations"""
+    def weight(col, weights):
+        return df[col].astype(object).map(weights).fillna(0).to_numpy(dtype=float)
+    
+    age = df['Age'].to_numpy(dtype=float)
+    age_points = np.select([(low <= age) & (age <= high) for low, high, _ in FALLBACK_AGE_BANDS],
+                           [points for _, _, points in FALLBACK_AGE_BANDS], 0)
+    score = (weight('EdLevel', FALLBACK_EDUCATION_SCORES) +
+             np.minimum(df['YearsCodePro'].to_numpy(dtype=float) * 4, 40) +
+             np.minimum(df['ComputerSkills'].to_numpy(dtype=float) * 2, 20) +
+             age_points + weight('JobRole', FALLBACK_ROLE_WEIGHTS) +
+             np.where(df['MentalHealth'].astype(object) == "Good", 10, 0))
+    return np.minimum(score, 150)
+
+# ====================== INCREMENTAL SCORING ======================
+def feature_fingerprints(df):
+    """Hash each row's feature columns so edits that affect the score can be detected"""
+    features = prepare_features(df)
+    if 'HaveWorkedWith' in df.columns:
+        features['HaveWorkedWith'] = df['HaveWorkedWith']
+    return pd.util.hash_pandas_object(features, index=False)
+
+def model_version(model, registry=None):
+    """Identify the model that produced a score; None means the rule-based fallback"""
+    if model is None:
+        return None
+    for source in (registry, model_registry):
+        if source is not None and model is source.model:
+            return (source.model_file, source.version)
+    return id(model)
+
+class ScoreTracker:
+    """Tracks which rows need a new PriorityScore since they were last scored"""
+    # A tracker for one JobRole only ever scores that role's rows
+    def __init__(self, job_role=None):
+        self.job_role = job_role
+        self.model_version = None
+        self.fingerprints = {}
+        self.dirty = set()
+    
+    def scope(self, df):
+        """Labels of the rows this tracker scores"""
+        if self.job_role is None:
+            return df.index
+        return df.index[(df['JobRole'] == self.job_role).to_numpy()]
+    
+    def adopt(self, df, version):
+        """Accept the scores already stored in df as current for the given model version"""
+        if self.job_role is not None:
+            df = df.loc[self.scope(df)]
+        if 'PriorityScore' in df.columns:
+            unscored = df.index[df['PriorityScore'].isna()]
+        else:
+            unscored = df.index
+        self.fingerprints = dict(zip(df.index, feature_fingerprints(df)))
+        self.dirty = set(unscored)
+        self.model_version = version
+    
+    def mark_dirty(self, labels):
+        self.dirty.update(labels)
+    
+    def rows_to_score(self, df, version):
+        """Return the row labels whose features changed, or every row if the model changed"""
+        if version != self.model_version:
+            return self.scope(df)
+        
+        labels = [label for label in self.dirty if label in df.index]
+        if not labels:
+            return df.index[:0]
+        
+        subset = df.loc[labels]
+        if 'PriorityScore' in subset.columns:
+            unscored = subset['PriorityScore'].isna().to_numpy()
+        else:
+            unscored = np.ones(len(labels), dtype=bool)
+        changed = [label for label, fingerprint, missing
+                   in zip(labels, feature_fingerprints(subset), unscored)
+                   if missing or self.fingerprints.get(label) != fingerprint]
+        return pd.Index(changed)
+    
+    def mark_scored(self, df, labels, version, fingerprints=None):
+        # fingerprints may be computed beforehand, outside the dataset lock
+        if fingerprints is None:
+            fingerprints = feature_fingerprints(df.loc[labels])
+        self.fingerprints.update(zip(labels, fingerprints))
+        # Rows outside df, such as the table's while df holds only new rows, stay dirty
+        self.dirty = {label for label in self.dirty if label not in df.index}
+        self.model_version = version
+
+def score_dirty_rows(df, model, tracker, skills=None, registry=None, rescore_all=True):
+    """Score only new or changed rows in place and return the labels that were scored"""
+    # Without rescore_all a model change only reaches the rows scored now; the
+    # rest keep their scores until the caller rescores them (see RoleShard.refresh)
+    version = model_version(model, registry)
+    if not rescore_all:
+        version = tracker.model_version
+    labels = tracker.rows_to_score(df, version)
+    if len(labels):
+        scores = predict_priority_scores(df.loc[labels], model, skills)
+        if 'PriorityScore' in df.columns:
+            scores = scores.astype(df['PriorityScore'].dtype)
+        df.loc[labels, 'PriorityScore'] = scores
+    tracker.mark_scored(df, labels, version)
+    return labels
+
+# ====================== RETRAINING ======================
+class RetrainScheduler:
+    """Retrains the model in the background once enough new recruiter decisions accumulate"""
+    # With a job_role it retrains that role's model from the role's rows alone, and
+    # only once the role has min_rows scored rows to learn from. on_saved is called
+    # on the retraining thread once a new model is live, e.g. to rescore with it.
+    def __init__(self, threshold=RETRAIN_THRESHOLD, warm_start_trees=WARM_START_TREES,
+                 registry=None, job_role=None, min_rows=0, on_saved=None):
+        self.threshold = threshold
+        self.on_saved = on_saved
+        self.warm_start_trees = warm_start_trees
+        self.registry = registry or model_registry
+        self.job_role = job_role
+        self.min_rows = min_rows
+        self.pending_labels = set()
+        self.history = []
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def record_decision(self, label):
+        """Note an Approved/Rejected decision and start a retrain once the threshold is reached"""
+        self.record_decisions([label])
+    
+    def record_decisions(self, labels):
+        with self._lock:
+            self.pending_labels.update(labels)
+            if len(self.pending_labels) >= self.threshold:
+                self._start()
+    
+    def retrain_now(self):
+        with self._lock:
+            self._start()
+    
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _start(self):
+        # Caller holds self._lock; at most one retrain runs at a time
+        if self.is_running() or not self.pending_labels:
+            return
+        labels, self.pending_labels = self.pending_labels, set()
+        self._thread = threading.Thread(target=self._retrain, args=(labels,), daemon=True)
+        self._thread.start()
+    
+    def _retrain(self, labels):
+        start = time.perf_counter()
+        # Copy what is needed and release the lock so registrations keep flowing
+        with dataset_lock:
+            df = get_dataset()
+            new_rows = df.loc[[label for label in labels if label in df.index]].copy()
+        new_rows = new_rows[~np.isnan(training_targets(new_rows))]
+        if new_rows.empty:
+            return
+        
+        model, encoder = self.registry.get()
+        full_df = None
+        mode = 'warm_start'
+        if model is None or not self._can_warm_start(model, encoder, new_rows):
+            mode = 'full'
+            with dataset_lock:
+                full_df = get_dataset()
+                if self.job_role is not None:
+                    full_df = full_df[full_df['JobRole'] == self.job_role]
+                full_df = full_df[TRAINING_COLUMNS].copy()
+            if full_df['PriorityScore'].notna().sum() < self.min_rows:
+                self.history.append({'mode': 'skipped', 'rows': len(full_df)})
+                return
+        
+        try:
+            if mode == 'warm_start':
+                new_model = self._warm_start(model, encoder, new_rows)
+            else:
+                new_model, encoder, _ = fit_random_forest_model(full_df)
+            version = save_model(new_model, encoder, self.registry)
+        except Exception as e:
+            # Put the decisions back so the next attempt includes them
+            with self._lock:
+                self.pending_labels.update(labels)
+            self.history.append({'mode': mode, 'error': repr(e)})
+            return
+        
+        self.history.append({'mode': mode, 'version': version, 'rows': len(new_rows),
+                             'trees': new_model.n_estimators,
+                             'seconds': time.perf_counter() - start})
+        if self.on_saved is not None:
+            self.on_saved()
+    
+    def _can_warm_start(self, model, encoder, new_rows):
+        if model.n_estimators + self.warm_start_trees > MAX_WARM_START_TREES:
+            return False
+        # New categories need new feature columns, which only a full refit can add
+        for col, positions in encoder.category_index.items():
+            if not set(new_rows[col].astype(str)) <= set(positions):
+                return False
+        return True
+    
+    def _warm_start(self, model, encoder, new_rows):
+        """Grow extra trees on the newly decided rows, leaving the live model untouched"""
+        new_model = copy.deepcopy(model)
+        new_model.set_params(warm_start=True, n_jobs=N_JOBS,
+                             n_estimators=model.n_estimators + self.warm_start_trees)
+        new_model.fit(encoder.transform(new_rows), training_targets(new_rows))
+        new_model.set_params(warm_start=False, n_jobs=None)
+        return new_model
+
 # ====================== PRIORITY QUEUE CLASS ======================
 class CandidatePriorityQueue:
-    def __init__(self, model, df):
-        self.pq = PriorityQueue()
-        self.model = model
-        self.df = df
-    
-    def add_candidate(self, candidate_data):
-        """Add a candidate to the priority queue with their Random Forest predicted score"""
-        # Predict the priority score using Random Forest
-        priority_score = predict_priority_score(candidate_data, self.model, self.df)
-        
-        # We use negative score because Python's PriorityQueue is a min-heap
-        # and we want highest scores first
-        self.pq.put((-priority_score, candidate_data['Name'], candidate_data))
+    """Candidates awaiting review, highest PriorityScore first, addressable by CandidateId"""
+    # Heap keys are (-score, name, insertion number): ties go alphabetically, then
+    # first come first served, and the comparison never reaches the candidates.
+    def __init__(self):
+        self.heap = IndexedHeap()
+        self.lock = threading.Lock()
+        self._counter = itertools.count()
+    
+    def _key(self, priority_score, name, order=None):
+        score = float(priority_score)
+        # Unscored candidates go last
+        return (-score if score == score else np.inf, str(name),
+                next(self._counter) if order is None else order)
+    
+    def heapify_frame(self, df):
+        """Replace the queue with every row of a scored frame, in O(n)"""
+        names = df['Name'].astype(str).tolist()
+        scores = df['PriorityScore'].to_numpy(dtype='float64', na_value=np.nan).tolist()
+        with self.lock:
+            keys = [self._key(score, name) for score, name in zip(scores, names)]
+            self.heap.heapify(df.index.tolist(), keys)
+    
+    def add_rows(self, df):
+        """Queue every row of a scored frame, re-keying the candidates already queued"""
+        names = df['Name'].astype(str).tolist()
+        scores = df['PriorityScore'].to_numpy(dtype='float64', na_value=np.nan).tolist()
+        with self.lock:
+            for label, score, name in zip(df.index.tolist(), scores, names):
+                self.heap.push(label, self._key(score, name))
+    
+    def load_pending(self, df, version, snapshot_file=QUEUE_SNAPSHOT_FILE):
+        """Fill the queue with the Pending rows of a scored frame, reusing a snapshot of the same storage version"""
+        # version is the stored dataset's stamp (see dataset.storage_version); checking
+        # it costs nothing, unlike comparing the snapshot against every Pending row
+        if self._load_snapshot(snapshot_file, version):
+            return
+        self.heapify_frame(df.loc[df['Status'] == "Pending", ['Name', 'PriorityScore']])
+        self.save_snapshot(version, snapshot_file)
+    
+    def _load_snapshot(self, snapshot_file, version):
+        if not os.path.exists(snapshot_file):
+            return False
+        try:
+            with open(snapshot_file, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False
+        if snapshot.get('version') != version:
+            return False
+        # The saved arrays are already in heap order, so no sifting is needed
+        with self.lock:
+            self.heap.keys, self.heap.items = snapshot['keys'], snapshot['items']
+            self.heap.positions = {item: i for i, item in enumerate(self.heap.items)}
+            self._counter = itertools.count(max((key[2] for key in self.heap.keys), default=-1) + 1)
+        return True
+    
+    def save_snapshot(self, version, snapshot_file=QUEUE_SNAPSHOT_FILE):
+        """Persist the queue so the next start can skip rebuilding it"""
+        with self.lock:
+            keys, items = list(self.heap.keys), list(self.heap.items)
+        # Recorded with the storage version the queue matches; the next start only
+        # reuses it if the dataset has not been written since
+        snapshot = {'version': version, 'keys': keys, 'items': items}
+        tmp_file = snapshot_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, snapshot_file)
+    
+    def update_score(self, label, priority_score):
+        """Re-prioritize a queued candidate; candidates not in the queue are ignored"""
+        with self.lock:
+            if label in self.heap:
+                _, name, order = self.heap.key(label)
+                self.heap.update(label, self._key(priority_score, name, order))
+    
+    def update_scores(self, df, labels):
+        """Re-prioritize the queued candidates among labels from their PriorityScore in df"""
+        for label, score in df.loc[labels, 'PriorityScore'].items():
+            self.update_score(label, score)
+    
+    def remove_candidates(self, labels):
+        """Take decided candidates out of the queue"""
+        with self.lock:
+            for label in labels:
+                self.heap.discard(label)
+    
+    def peek(self):
+        """(CandidateId, heap key) of the best queued candidate, or None when empty"""
+        with self.lock:
+            return self.heap.peek() if len(self.heap) else None
+    
+    def top_candidates(self, k):
+        """CandidateIds of the best k queued candidates, without removing them"""
+        with self.lock:
+            return [item for item, _ in self.heap.top(k)]
     
     def get_next_candidate(self):
         """Get the highest priority candidate from the queue"""
-        if not self.pq.empty():
-            return self.pq.get()[2]  # Return the candidate_data
-        return None
+        with self.lock:
+            if not len(self.heap):
+                return None
+            item, _ = self.heap.pop()
+        with dataset_lock:
+            # Not to_dict(), which widens float32 scores to floats like 51.54166793823242
+            return dict(get_dataset().loc[item].items())
     
     def size(self):
-        return self.pq.qsize()
+        return len(self.heap)
     
     def is_empty(self):
-        return self.pq.empty()
-
-# ====================== INITIALIZATION ======================
-def initialize_priority_system():
-    """Initialize the priority system and return model and queue"""
-    df = load_dataset()
-    model = load_or_train_model(df)
-    priority_queue = CandidatePriorityQueue(model, df)
-    return model, priority_queue
\ No newline at end of file
+        return not len(self.heap)
+    
+    def memory_bytes(self):
+        """Approximate memory held by the queued entries"""
+        with self.lock:
+            return (sys.getsizeof(self.heap.keys) + sys.getsizeof(self.heap.items) +
+                    sys.getsizeof(self.heap.positions) +
+                    sum(sys.getsizeof(key) + sys.getsizeof(key[1]) for key in self.heap.keys))
+
+# ====================== COMMAND LINE ======================
+def main(argv=None):
+    """Train the priority model from the command line, without the GUI"""
+    parser = argparse.ArgumentParser(description="Train the candidate priority Random Forest")
+    parser.add_argument("--csv", default=None, help="dataset to train on (default: the application's CSV)")
+    parser.add_argument("--trees", type=int, default=N_ESTIMATORS, help="number of trees")
+    parser.add_argument("--max-depth", type=int, default=MAX_DEPTH, help="maximum tree depth")
+    parser.add_argument("--jobs", type=int, default=N_JOBS, help="parallel workers (-1 = all cores)")
+    parser.add_argument("--no-save", action="store_true", help="benchmark only; keep the current model")
+    parser.add_argument("--role", default=None, choices=JOB_ROLES,
+                        help="train only this JobRole's model, on its rows alone")
+    parser.add_argument("--force", action="store_true",
+                        help=f"train a role's model even with fewer than {MIN_SHARD_ROWS} scored rows")
+    args = parser.parse_args(argv)
+    
+    # Streamed in chunks of just the training columns, so large tables fit in memory
+    df = load_columns(TRAINING_COLUMNS, csv_file=args.csv or CSV_FILE)
+    registry = model_registry
+    if args.role is not None:
+        df = df[df['JobRole'] == args.role]
+        registry = ModelRegistry(*role_files(args.role)[:2])
+        # The application would not give the role a model of its own yet
+        rows = int(np.count_nonzero(~np.isnan(training_targets(df))))
+        if rows < MIN_SHARD_ROWS and not args.force:
+            parser.error(f"{args.role} has {rows} scored rows; a role's model needs {MIN_SHARD_ROWS} "
+                         f"(use --force to train it anyway)")
+    try:
+        model, encoder, report = benchmark_training(df, args.trees, args.max_depth, args.jobs)
+    except ValueError as e:
+        # Too few rows to split off a holdout set
+        parser.error(f"cannot train on {len(df)} rows: {e}")
+    if not args.no_save:
+        save_model(model, encoder, registry)
+    
+    for key, value in report.items():
+        print(f"{key:>15}: {value:.4f}" if isinstance(value, float) else f"{key:>15}: {value}")
+    print(f"{'saved':>15}: {registry.model_file if not args.no_save else 'no'}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
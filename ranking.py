@@ -0,0 +1,143 @@
+import bisect
+import heapq
+import threading
+from itertools import islice
+import numpy as np
+import pandas as pd
+
+# ====================== CONSTANTS ======================
+# Restrictions matching fewer than 1 in SPARSE_RATIO candidates are ranked directly
+SPARSE_RATIO = 30
+# The only columns the index reads; dataset.load_columns(RANKED_COLUMNS) is enough to build it
+RANKED_COLUMNS = ['Status', 'JobRole', 'PriorityScore']
+
+# ====================== RANKING INDEX ======================
+class RankingIndex:
+    """Candidates bucketed by (Status, JobRole), each bucket kept sorted by PriorityScore"""
+    # Buckets hold (-score, label) keys in ascending order, so the best candidate
+    # is first and a filtered top K is a K-step merge over the matching buckets.
+    def __init__(self):
+        self.buckets = {}
+        self.entries = {}  # label -> (bucket, sort key)
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def _sort_key(score, label):
+        score = float(score)
+        # Unscored candidates rank last
+        return (-score if score == score else np.inf, label)
+
+    def build(self, df):
+        """Rebuild every bucket from the candidate table"""
+        keys = -df['PriorityScore'].to_numpy(dtype='float64', na_value=np.nan)
+        keys[np.isnan(keys)] = np.inf
+        labels = df.index.to_numpy()
+        # Sorting on integer codes is far cheaper than on the strings themselves
+        statuses, status_names = pd.factorize(df['Status'])
+        roles, role_names = pd.factorize(df['JobRole'])
+        order = np.lexsort((labels, keys, roles, statuses))
+
+        statuses, roles = statuses[order], roles[order]
+        sort_keys = list(zip(keys[order].tolist(), labels[order].tolist()))
+        # Rows are grouped by bucket now; split them where the bucket changes
+        changes = np.flatnonzero((statuses[1:] != statuses[:-1]) | (roles[1:] != roles[:-1])) + 1
+        # An empty table has no buckets at all
+        starts = [0] + changes.tolist() if len(sort_keys) else []
+        ends = changes.tolist() + [len(sort_keys)]
+
+        buckets, entries = {}, {}
+        for start, end in zip(starts, ends):
+            bucket = (str(status_names[statuses[start]]), str(role_names[roles[start]]))
+            bucket_keys = buckets[bucket] = sort_keys[start:end]
+            entries.update((key[1], (bucket, key)) for key in bucket_keys)
+        with self.lock:
+            self.buckets, self.entries = buckets, entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def remove(self, label):
+        with self.lock:
+            entry = self.entries.pop(label, None)
+            if entry is None:
+                return
+            bucket, key = entry
+            keys = self.buckets[bucket]
+            del keys[bisect.bisect_left(keys, key)]
+
+    def update(self, label, status, job_role, score):
+        """Insert a candidate, or move it after a status or score change"""
+        with self.lock:
+            self.remove(label)
+            bucket, key = (str(status), str(job_role)), self._sort_key(score, label)
+            bisect.insort(self.buckets.setdefault(bucket, []), key)
+            self.entries[label] = (bucket, key)
+
+    def update_rows(self, df, labels):
+        """Re-index the given rows of the candidate table"""
+        # A model change re-scores most of the table; rebuilding is cheaper than moving each row.
+        # df may hold only some rows, such as a new registration, and then cannot rebuild
+        if len(labels) > len(self.entries) // 4 and len(df) >= len(self.entries):
+            return self.build(df)
+        rows = df.loc[labels, RANKED_COLUMNS]
+        for label, status, job_role, score in rows.itertuples():
+            self.update(label, status, job_role, score)
+
+    def ranked(self, status=None, job_role=None, within=None):
+        """A RankedView of every candidate matching the filters, highest PriorityScore first"""
+        # within optionally restricts the result to a collection of labels, e.g. search hits
+        with self.lock:
+            if within is not None and len(within) * SPARSE_RATIO <= len(self.entries):
+                # Few hits: rank them directly rather than walking the buckets past the misses
+                keys = sorted(key for (bucket_status, bucket_role), key in map(self.entries.get, within)
+                              if status in (None, bucket_status) and job_role in (None, bucket_role))
+                return RankedView(self, (label for _, label in keys), len(keys))
+
+            matching = [keys for (bucket_status, bucket_role), keys in self.buckets.items()
+                        if status in (None, bucket_status) and job_role in (None, bucket_role)]
+            total = sum(map(len, matching))
+            labels = (label for _, label in heapq.merge(*matching))
+            if within is None:
+                return RankedView(self, labels, total)
+            # How many hits fall in the matching buckets is only known once the merge is done
+            estimate = len(within) * total // max(len(self.entries), 1)
+            return RankedView(self, filter(within.__contains__, labels), estimate)
+
+    def below(self, score, status=None, job_role=None):
+        """Labels of the scored candidates matching the filters with PriorityScore under score"""
+        with self.lock:
+            labels = []
+            for (bucket_status, bucket_role), keys in self.buckets.items():
+                if status in (None, bucket_status) and job_role in (None, bucket_role):
+                    # Keys are (-score, label): lower scores sit after -score, unscored rows at the end
+                    start = bisect.bisect_right(keys, (-float(score), np.inf))
+                    end = bisect.bisect_left(keys, (np.inf,))
+                    labels.extend(label for _, label in keys[start:end])
+            return labels
+
+    def top(self, status=None, job_role=None, k=None, within=None):
+        """Labels of the best k candidates matching the filters, highest PriorityScore first"""
+        return self.ranked(status, job_role, within).fetch(0, k)
+
+class RankedView:
+    """One filter's ranking, merged lazily as far as it has been read"""
+    def __init__(self, ranking, labels, size):
+        self.ranking = ranking
+        self.labels = []
+        self.pending = labels
+        self.size = size
+
+    def __len__(self):
+        """The number of matches; an estimate until the ranking has been read to the end"""
+        return len(self.labels) if self.pending is None else max(self.size, len(self.labels))
+
+    def fetch(self, start, stop=None):
+        """Labels ranked start to stop, merging further into the buckets if needed"""
+        if self.pending is not None and (stop is None or stop > len(self.labels)):
+            wanted = None if stop is None else stop - len(self.labels)
+            with self.ranking.lock:
+                read = list(islice(self.pending, wanted))
+            self.labels.extend(read)
+            if wanted is None or len(read) < wanted:
+                self.pending = None
+        return self.labels[start:stop]
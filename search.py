@@ -0,0 +1,197 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# ====================== CONSTANTS ======================
+SEARCH_COLUMNS = ['Name', 'JobRole', 'Country']
+NGRAM = 3
+# Values added after the last build are scanned directly until there are this many
+REINDEX_EVERY = 5000
+# Rows added since the last search are merged into the label order this many at a time
+MERGE_ROWS_EVERY = 1000
+BUILD_CHUNK = 50000
+# Results up to this size answer `in` from a set instead of a binary search
+MEMBER_SET_LIMIT = 100000
+CODEPOINT_BITS = 21
+
+def _codepoints(values):
+    """Zero-padded (len(values), width) matrix of unicode code points"""
+    matrix = np.array(values, dtype=str)
+    width = matrix.dtype.itemsize // 4
+    return matrix.view(np.uint32).reshape(len(values), width).astype(np.int64)
+
+def _gram_keys(codepoints):
+    # Each trigram packed into one integer; valid where the window has no padding
+    keys = ((codepoints[:, :-2] << (2 * CODEPOINT_BITS)) |
+            (codepoints[:, 1:-1] << CODEPOINT_BITS) | codepoints[:, 2:])
+    return keys, codepoints[:, 2:] != 0
+
+# ====================== SEARCH INDEX ======================
+class SearchResult:
+    """Labels of the rows matching a query; supports len(), iteration and `in`"""
+    __slots__ = ('labels', 'mask', 'count', '_members')
+
+    def __init__(self, labels, mask):
+        self.labels = labels
+        self.mask = mask
+        self.count = int(np.count_nonzero(mask))
+        self._members = None
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.labels[self.mask].tolist())
+
+    def __contains__(self, label):
+        if self.count <= MEMBER_SET_LIMIT:
+            if self._members is None:
+                self._members = set(self)
+            return label in self._members
+        # Too many hits to copy into a set; labels is sorted, so binary search it
+        position = np.searchsorted(self.labels, label)
+        return position < len(self.labels) and self.labels[position] == label and bool(self.mask[position])
+
+class SearchIndex:
+    """Case-insensitive substring search over Name, JobRole, Country and, optionally, skills"""
+    # Every distinct lowercase field value is stored once, with an inverted index
+    # from trigrams to the values containing them. A query only checks the values
+    # sharing all its trigrams, then maps the matches back to rows by value id.
+    # Skills come from a SkillMatrix: the query is matched against its vocabulary
+    # and the rows listing any matching skill are read off the sparse matrix.
+    def __init__(self, skills=None):
+        self.skills = skills
+        self.values = []
+        self.value_ids = {}
+        self.labels = np.empty(0, dtype=np.int64)
+        self.codes = [np.empty(0, dtype=np.int32) for _ in SEARCH_COLUMNS]
+        self.pending = []  # (label, value id per column) of rows added since the last merge
+        self._index_values()
+        self.lock = threading.RLock()
+
+    def _value_id(self, value):
+        value_id = self.value_ids.get(value)
+        if value_id is None:
+            value_id = self.value_ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def _index_values(self):
+        """Rebuild the trigram postings over every known value"""
+        keys, value_ids = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        for start in range(0, len(self.values), BUILD_CHUNK):
+            chunk = self.values[start:start + BUILD_CHUNK]
+            chunk_keys, valid = _gram_keys(_codepoints(chunk))
+            rows, _ = np.nonzero(valid)
+            keys.append(chunk_keys[valid])
+            value_ids.append(rows + start)
+        keys, value_ids = np.concatenate(keys), np.concatenate(value_ids)
+
+        # A stable sort keeps each trigram's value ids in ascending order
+        order = np.argsort(keys, kind='stable')
+        keys, value_ids = keys[order], value_ids[order]
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (value_ids[1:] != value_ids[:-1])
+        self.gram_keys, starts = np.unique(keys[keep], return_index=True)
+        self.gram_starts = np.append(starts, keep.sum())
+        self.gram_values = value_ids[keep].astype(np.int32)
+
+        # Values too short to hold a trigram, and values added later, are checked one by one
+        self.indexed_count = len(self.values)
+        self.unindexed = [i for i, value in enumerate(self.values) if len(value) < NGRAM]
+        self._last = None
+
+    def build(self, df):
+        """Index every row of the candidate table"""
+        order = np.argsort(df.index.to_numpy(), kind='stable')
+        with self.lock:
+            self.values, self.value_ids = [], {}
+            self.codes = []
+            for col in SEARCH_COLUMNS:
+                # Lowercase each distinct value once rather than every row
+                codes, uniques = pd.factorize(df[col])
+                ids = np.array([self._value_id(str(value).lower()) for value in uniques], dtype=np.int32)
+                self.codes.append(ids[codes[order]])
+            self.labels = df.index.to_numpy()[order].astype(np.int64)
+            self.pending = []
+            self._index_values()
+
+    def add(self, label, row):
+        """Index one new row; row maps each of SEARCH_COLUMNS to its value"""
+        # Inserting into the sorted arrays would copy them per row; rows wait and are merged in one pass
+        with self.lock:
+            self.pending.append((label, [self._value_id(str(row[col]).lower()) for col in SEARCH_COLUMNS]))
+            if len(self.pending) >= MERGE_ROWS_EVERY:
+                self._merge_pending()
+            if len(self.values) - self.indexed_count >= REINDEX_EVERY:
+                self._index_values()
+            self._last = None
+
+    def _merge_pending(self):
+        labels, value_ids = zip(*self.pending)
+        labels = np.concatenate([self.labels, np.array(labels, dtype=np.int64)])
+        order = np.argsort(labels, kind='stable')
+        self.labels = labels[order]
+        value_ids = np.array(value_ids, dtype=np.int32).reshape(len(self.pending), len(SEARCH_COLUMNS))
+        self.codes = [np.concatenate([codes, value_ids[:, i]])[order] for i, codes in enumerate(self.codes)]
+        self.pending = []
+
+    def _posting(self, key):
+        i = np.searchsorted(self.gram_keys, key)
+        if i == len(self.gram_keys) or self.gram_keys[i] != key:
+            return self.gram_values[:0]
+        return self.gram_values[self.gram_starts[i]:self.gram_starts[i + 1]]
+
+    def _short_query_matches(self, query, matched):
+        # A query shorter than a trigram matches every value holding a trigram that contains it
+        parts = [(self.gram_keys >> shift) & ((1 << CODEPOINT_BITS) - 1)
+                 for shift in (2 * CODEPOINT_BITS, CODEPOINT_BITS, 0)]
+        points = [ord(char) for char in query]
+        hits = np.zeros(len(self.gram_keys), dtype=bool)
+        for offset in range(NGRAM - len(points) + 1):
+            window = np.ones(len(self.gram_keys), dtype=bool)
+            for part, point in zip(parts[offset:], points):
+                window &= part == point
+            hits |= window
+        matched[self.gram_values[np.repeat(hits, np.diff(self.gram_starts))]] = True
+
+    def _candidates(self, query):
+        keys, _ = _gram_keys(_codepoints([query]))
+        postings = sorted((self._posting(key) for key in set(keys[0].tolist())), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        # A query extending the previous one can only match a subset of its values
+        if self._last is not None and self._last[0] in query and len(self._last[1]) < len(candidates):
+            candidates = np.intersect1d(candidates, self._last[1], assume_unique=True)
+        return candidates
+
+    def search(self, query):
+        """Rows whose Name, JobRole, Country or one of their skills contains query, ignoring case"""
+        query = query.lower()
+        with self.lock:
+            if self.pending:
+                self._merge_pending()
+            values = self.values
+            matched = np.zeros(len(values), dtype=bool)
+            if len(query) < NGRAM:
+                self._short_query_matches(query, matched)
+            else:
+                candidates = self._candidates(query)
+                if len(query) > NGRAM:
+                    candidates = [i for i in candidates.tolist() if query in values[i]]
+                matched[candidates] = True
+                self._last = (query, np.flatnonzero(matched[:self.indexed_count]))
+            unindexed = self.unindexed + list(range(self.indexed_count, len(values)))
+            matched[[i for i in unindexed if query in values[i]]] = True
+
+            rows = np.zeros(len(self.labels), dtype=bool)
+            for codes in self.codes:
+                rows |= matched[codes]
+            if self.skills is not None:
+                skill_ids = self.skills.vocabulary.matching(query)
+                if skill_ids:
+                    rows |= np.isin(self.labels, self.skills.labels_with_any(skill_ids))
+            return SearchResult(self.labels, rows)
@@ -0,0 +1,207 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from dataset import dataset_lock, get_dataset, storage_version
+from features import FEATURE_COLUMNS
+from random_forest_priority import (MIN_SHARD_ROWS, CandidatePriorityQueue, ModelRegistry, RetrainScheduler,
+                                    ScoreTracker, feature_fingerprints, model_registry, model_version,
+                                    predict_priority_scores, role_files, score_dirty_rows)
+
+# ====================== CONSTANTS ======================
+# Tracked model version of stored scores from a model that has since been replaced;
+# it matches no model, so those scores are refreshed
+STALE_SCORES = "stale"
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+# ====================== ROLE SHARD ======================
+class RoleShard:
+    """Model, score tracking, retraining and review queue for the candidates of one JobRole"""
+    # Nothing is read until the shard is used: its model on the first scoring of
+    # the role, its queue on the first review. Until the role has a model of its
+    # own it is scored with the shared all-roles model. A model change only scores
+    # the rows at hand; the rest of the role is rescored by refresh() on a thread
+    # of its own, and on_rescored(df, labels) is told of the new scores.
+    def __init__(self, job_role, skills=None, model_signatures=None, on_rescored=None):
+        self.job_role = job_role
+        model_file, encoder_file, self.queue_file = role_files(job_role)
+        self.registry = ModelRegistry(model_file, encoder_file)
+        self.tracker = ScoreTracker(job_role)
+        self.retrain_scheduler = RetrainScheduler(registry=self.registry, job_role=job_role,
+                                                  min_rows=MIN_SHARD_ROWS, on_saved=self.refresh)
+        self.skills = skills
+        # Model file -> signature when the stored scores were loaded
+        self.model_signatures = model_signatures or {}
+        self.on_rescored = on_rescored
+        self.queue = None
+        self._adopted = False
+        self._refresh_thread = None
+        self.lock = threading.Lock()
+
+    def model(self):
+        """The role's own model, or the shared one while the role has none"""
+        model, _ = self.registry.get()
+        if model is None:
+            model, _ = model_registry.get()
+        return model
+
+    def _adopt(self, df, model):
+        # Stored scores are current if they came from the model in place at startup
+        model_file = self.registry.model_file
+        if not os.path.exists(model_file):
+            model_file = model_registry.model_file
+        version = model_version(model, self.registry)
+        if _file_signature(model_file) != self.model_signatures.get(model_file):
+            version = STALE_SCORES
+        self.tracker.adopt(df, version)
+        self._adopted = True
+
+    def score(self, df, labels, skills=None, table=None):
+        """Score the given and any other changed rows of the role in place; returns the labels scored"""
+        # df may hold only some rows, such as a new registration; table() returns the
+        # whole candidate table for when the role must be adopted
+        with self.lock:
+            model = self.model()
+            if not self._adopted:
+                self._adopt(df if table is None else table(), model)
+            self.tracker.mark_dirty(labels)
+            scored = score_dirty_rows(df, model, self.tracker, skills, self.registry, rescore_all=False)
+            stale = model_version(model, self.registry) != self.tracker.model_version
+        if stale:
+            self.refresh()
+        return scored
+
+    def refresh(self):
+        """Rescore the whole role with its current model in the background, unless it is up to date"""
+        with self.lock:
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = threading.Thread(target=self._rescore_all, daemon=True)
+                self._refresh_thread.start()
+
+    def _rescore_all(self):
+        # Registrations keep flowing while the model predicts: the dataset lock is only
+        # held to copy the role's features and to write the new scores back
+        while True:
+            model = self.model()
+            version = model_version(model, self.registry)
+            with dataset_lock:
+                df = get_dataset()
+                with self.lock:
+                    if not self._adopted:
+                        self._adopt(df, model)
+                    if version == self.tracker.model_version:
+                        return
+                labels = self.tracker.scope(df)
+                rows = df.loc[labels, [col for col in FEATURE_COLUMNS + ['HaveWorkedWith'] if col in df.columns]]
+                rows = rows.copy()
+            scores = predict_priority_scores(rows, model, self.skills)
+            fingerprints = feature_fingerprints(rows)
+
+            with dataset_lock:
+                df = get_dataset()
+                with self.lock:
+                    if model_version(self.model(), self.registry) != version:
+                        continue  # replaced again while predicting; start over with the newer one
+                    df.loc[labels, 'PriorityScore'] = scores.astype(df['PriorityScore'].dtype)
+                    self.tracker.mark_scored(df, labels, version, fingerprints)
+                if self.on_rescored is not None:
+                    self.on_rescored(df, labels)
+            return
+
+    def load_queue(self):
+        """The role's review queue, built from its Pending candidates the first time it is needed"""
+        with dataset_lock:
+            # Built under the dataset lock so no registration or decision slips past it
+            if self.queue is None:
+                df = get_dataset()
+                rows = df[df['JobRole'] == self.job_role]
+                queue = CandidatePriorityQueue()
+                queue.load_pending(rows, storage_version(), self.queue_file)
+                self.queue = queue
+            return self.queue
+
+# ====================== ROLE SHARDS ======================
+class RoleShards:
+    """One RoleShard per JobRole, created the first time its role comes up"""
+    # Built once the stored scores are loaded: the model files in place now are taken
+    # to be the ones those scores came from. skills and on_rescored go to every shard.
+    def __init__(self, roles=(), skills=None, on_rescored=None):
+        self.roles = list(roles)
+        self.skills = skills
+        self.on_rescored = on_rescored
+        self.model_signatures = {path: _file_signature(path) for path in
+                                 [model_registry.model_file] + [role_files(role)[0] for role in self.roles]}
+        self.shards = {}
+        self.lock = threading.Lock()
+        # Every decision also refreshes the shared model used by roles without their own
+        self.retrain_scheduler = RetrainScheduler(on_saved=self.refresh)
+
+    def __getitem__(self, job_role):
+        job_role = str(job_role)
+        with self.lock:
+            shard = self.shards.get(job_role)
+            if shard is None:
+                shard = self.shards[job_role] = RoleShard(job_role, self.skills, self.model_signatures,
+                                                          self.on_rescored)
+                if job_role not in self.roles:
+                    self.roles.append(job_role)
+            return shard
+
+    def loaded(self):
+        with self.lock:
+            return list(self.shards.values())
+
+    def refresh(self):
+        """Rescore, in the background, every loaded role whose model changed"""
+        for shard in self.loaded():
+            shard.refresh()
+
+    def _by_role(self, df, labels):
+        """(shard, labels) for each JobRole among the given rows"""
+        roles = df.loc[labels, 'JobRole'].astype(str)
+        return [(self[role], rows.index) for role, rows in roles.groupby(roles, sort=False)]
+
+    def score(self, df, labels, skills=None, table=None):
+        """Score new or changed rows with their role's model; returns every label scored"""
+        # A role whose model changed is rescored in full in the background (see RoleShard.refresh)
+        scored = [shard.score(df, role_labels, skills, table) for shard, role_labels in self._by_role(df, labels)]
+        return pd.Index(np.concatenate([np.asarray(part) for part in scored]) if scored else [],
+                        dtype=df.index.dtype)
+
+    def queued(self, df, labels):
+        """(queue, labels) for the roles among the given rows whose queue is loaded"""
+        return [(shard.queue, role_labels) for shard, role_labels in self._by_role(df, labels)
+                if shard.queue is not None]
+
+    def record_decisions(self, df, labels):
+        """Count Approved/Rejected decisions towards the shared and the role models' retraining"""
+        self.retrain_scheduler.record_decisions(labels)
+        for shard, role_labels in self._by_role(df, labels):
+            shard.retrain_scheduler.record_decisions(role_labels)
+
+    def next_candidate(self, job_role=None):
+        """Take the best Pending candidate off one role's review queue, or off every role's"""
+        if job_role is not None:
+            return self[job_role].load_queue().get_next_candidate()
+        # Each queue is ordered, so the best of their heads is the best overall
+        queues = [self[role].load_queue() for role in list(self.roles)]
+        heads = [(head[1], queue) for head, queue in ((queue.peek(), queue) for queue in queues)
+                 if head is not None]
+        if not heads:
+            return None
+        return min(heads, key=lambda head: head[0])[1].get_next_candidate()
+
+    def save_snapshots(self):
+        """Persist every loaded review queue"""
+        # Under the dataset lock, so no write lands between reading the version and the queues
+        with dataset_lock:
+            version = storage_version()
+            for shard in self.loaded():
+                if shard.queue is not None:
+                    shard.queue.save_snapshot(version, shard.queue_file)
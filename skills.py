@@ -0,0 +1,171 @@
+import re
+import threading
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# ====================== CONSTANTS ======================
+# HaveWorkedWith is a free-text list; "/" stays inside a skill, as in "CI/CD"
+SKILL_SEPARATORS = re.compile(r"[,;\n]")
+# Updated rows are kept aside and merged into the matrix once there are this many
+MERGE_EVERY = 5000
+
+# ====================== TOKENIZER ======================
+def normalize_skill(skill):
+    """Canonical form of one skill: trimmed, single-spaced and case-folded"""
+    return " ".join(skill.split()).casefold()
+
+def tokenize_skills(text):
+    """Distinct normalized skills in a HaveWorkedWith string, in the order given"""
+    if not isinstance(text, str):
+        return []
+    tokens = (normalize_skill(part) for part in SKILL_SEPARATORS.split(text))
+    return list(dict.fromkeys(token for token in tokens if token))
+
+class SkillVocabulary:
+    """Interns every normalized skill seen so far as a matrix column id"""
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    def get(self, skill):
+        return self.ids.get(normalize_skill(skill))
+
+    def intern(self, tokens):
+        """Column ids of already-normalized tokens, adding the new ones"""
+        with self.lock:
+            ids = []
+            for token in tokens:
+                skill_id = self.ids.get(token)
+                if skill_id is None:
+                    skill_id = self.ids[token] = len(self.names)
+                    self.names.append(token)
+                ids.append(skill_id)
+            return ids
+
+    def matching(self, query):
+        """Ids of the skills containing query, ignoring case"""
+        query = normalize_skill(query)
+        return [skill_id for skill_id, name in enumerate(self.names) if query in name]
+
+def _rows(id_lists, width):
+    indptr = np.cumsum([0] + [len(ids) for ids in id_lists])
+    indices = np.fromiter((i for ids in id_lists for i in ids), dtype=np.int32, count=indptr[-1])
+    return sparse.csr_matrix((np.ones(len(indices), dtype=bool), indices, indptr),
+                             shape=(len(id_lists), width))
+
+def encode_skills(values, vocabulary):
+    """CSR matrix with a row per HaveWorkedWith value, tokenizing each distinct value once"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    id_lists = [vocabulary.intern(tokenize_skills(value)) for value in uniques]
+    # Missing values have code -1, which picks the empty row appended last
+    return _rows(id_lists + [[]], len(vocabulary))[codes]
+
+def has_skills(rows, vocabulary, skills):
+    """Dense (rows, skills) bool array of which rows list each of the given skills"""
+    present = np.zeros((rows.shape[0], len(skills)), dtype=bool)
+    known = [(i, vocabulary.get(skill)) for i, skill in enumerate(skills)]
+    known = [(i, skill_id) for i, skill_id in known if skill_id is not None and skill_id < rows.shape[1]]
+    if known and rows.shape[0]:
+        columns, skill_ids = zip(*known)
+        present[:, list(columns)] = rows[:, list(skill_ids)].toarray()
+    return present
+
+def candidate_skills(candidates, skills=None):
+    """(CSR rows aligned with the frame, vocabulary), from a SkillMatrix when one is given"""
+    if skills is not None:
+        return skills.rows(candidates.index), skills.vocabulary
+    vocabulary = SkillVocabulary()
+    values = candidates['HaveWorkedWith'] if 'HaveWorkedWith' in candidates.columns else [None] * len(candidates)
+    return encode_skills(values, vocabulary), vocabulary
+
+# ====================== SKILL MATRIX ======================
+class SkillMatrix:
+    """Sparse candidate x skill matrix with a row per CandidateId, in ascending order"""
+    # New and edited rows wait in a small side table so that registering a
+    # candidate does not copy the whole matrix; they are merged in batches.
+    def __init__(self, vocabulary=None):
+        self.vocabulary = vocabulary if vocabulary is not None else SkillVocabulary()
+        self.labels = np.empty(0, dtype=np.int64)
+        self.matrix = sparse.csr_matrix((0, 0), dtype=bool)
+        self.pending = {}  # label -> skill ids, replacing the label's row in matrix
+        self._by_skill = None
+        self.lock = threading.RLock()
+
+    def build(self, df):
+        """Tokenize the HaveWorkedWith column of the whole candidate table"""
+        order = np.argsort(df.index.to_numpy(), kind='stable')
+        matrix = encode_skills(df['HaveWorkedWith'], self.vocabulary)[order]
+        with self.lock:
+            self.labels = df.index.to_numpy()[order].astype(np.int64)
+            self.matrix = matrix
+            self.pending = {}
+            self._by_skill = None
+
+    def set_skills(self, label, text):
+        """Add a candidate's row, or replace it after their skills changed"""
+        ids = self.vocabulary.intern(tokenize_skills(text))
+        with self.lock:
+            self.pending[int(label)] = ids
+            if len(self.pending) >= MERGE_EVERY:
+                self._merge()
+
+    def _merge(self):
+        labels = np.fromiter(self.pending, dtype=np.int64, count=len(self.pending))
+        keep = ~np.isin(self.labels, labels)
+        width = len(self.vocabulary)
+        matrix = self.matrix[keep]
+        matrix.resize((matrix.shape[0], width))
+        matrix = sparse.vstack([matrix, _rows(list(self.pending.values()), width)], format='csr')
+        labels = np.concatenate([self.labels[keep], labels])
+        order = np.argsort(labels, kind='stable')
+        self.labels, self.matrix = labels[order], matrix[order]
+        self.pending = {}
+        self._by_skill = None
+
+    def _positions(self, labels):
+        positions = np.searchsorted(self.labels, labels)
+        found = positions < len(self.labels)
+        found[found] = self.labels[positions[found]] == labels[found]
+        return positions, found
+
+    def rows(self, labels):
+        """CSR rows for the given CandidateIds, in that order; unknown ids get empty rows"""
+        labels = np.asarray(labels, dtype=np.int64)
+        with self.lock:
+            width = len(self.vocabulary)
+            positions, found = self._positions(labels)
+            waiting = np.array([label in self.pending for label in labels.tolist()], dtype=bool)
+            found &= ~waiting
+            matrix = self.matrix[positions[found]]
+            matrix.resize((matrix.shape[0], width))
+            new_rows = _rows([self.pending[label] for label in labels[waiting].tolist()], width)
+            missing = int(np.count_nonzero(~found & ~waiting))
+            stacked = sparse.vstack([matrix, new_rows, sparse.csr_matrix((missing, width), dtype=bool)],
+                                    format='csr')
+            # Put the three groups back in the order they were asked for
+            sources = np.concatenate([np.flatnonzero(found), np.flatnonzero(waiting),
+                                      np.flatnonzero(~found & ~waiting)])
+            return stacked[np.argsort(sources, kind='stable')]
+
+    def labels_with_any(self, skill_ids):
+        """Sorted CandidateIds of the rows listing at least one of the given skills"""
+        with self.lock:
+            if self._by_skill is None:
+                self._by_skill = self.matrix.tocsc()
+            columns = [i for i in skill_ids if i < self._by_skill.shape[1]]
+            by_skill = self._by_skill
+            rows = np.unique(np.concatenate(
+                [by_skill.indices[by_skill.indptr[i]:by_skill.indptr[i + 1]] for i in columns]
+                or [np.empty(0, dtype=np.int32)]))
+            labels = self.labels[rows]
+            if not self.pending:
+                return labels
+            wanted = set(skill_ids)
+            labels = labels[~np.isin(labels, list(self.pending))]
+            added = [label for label, ids in self.pending.items() if wanted.intersection(ids)]
+            return np.union1d(labels, np.array(added, dtype=np.int64))
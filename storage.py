@@ -0,0 +1,457 @@
+import pandas as pd
+import numpy as np
+import os
+import json
+import hashlib
+import pickle
+import sqlite3
+from constants import ID_COLUMN
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+# ====================== CONSTANTS ======================
+JOURNAL_SUFFIX = ".journal"
+COMPACT_EVERY = 1000  # journal entries before the CSV is rewritten
+STORAGE_BACKEND = os.environ.get("CANDIDATE_STORE", "csv")  # "csv" or "sqlite"
+TABLE = "candidates"
+# Indexes earlier databases were given that no query uses; dropped so writes stop maintaining them
+UNUSED_INDEXES = ['idx_Name', 'idx_Status', 'idx_JobRole', 'idx_PriorityScore', 'idx_status_role_score']
+SNAPSHOT_REFRESH_ROWS = 1000  # rows appended since the snapshot before it is rebuilt
+DIGEST_CHUNK_BYTES = 1 << 20  # bytes hashed at a time when checking a snapshot
+READ_CHUNK_ROWS = 50000  # rows per chunk when streaming the table
+# Username as _normalize_username() sees it, for SQL; indexed, so lookups use exactly this expression
+NORMALIZED_USERNAME_SQL = "lower(trim(Username, ' ' || char(9, 10, 11, 12, 13)))"
+
+# ====================== HELPERS ======================
+def _file_stamp(path):
+    """(size, modification time) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    raise TypeError(f"Cannot store value of type {type(value).__name__}")
+
+def _clean(value):
+    # pandas uses NaN for empty cells; the journal stores them as null
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value
+
+def _sql_value(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    return _clean(value)
+
+def _normalize_username(value):
+    return value.strip().lower() if isinstance(value, str) else ""
+
+def assign_candidate_ids(df):
+    """Index the table by CandidateId, numbering rows without one; True if any were numbered"""
+    had_ids = ID_COLUMN in df.columns
+    if had_ids:
+        ids = pd.to_numeric(df[ID_COLUMN], errors='coerce')
+    else:
+        # Tables from before ids existed keep their row labels as ids
+        ids = pd.Series(df.index, index=df.index, dtype='float64')
+    missing = ids.isna().to_numpy()
+    if missing.any():
+        start = 0 if missing.all() else int(ids.max()) + 1
+        ids[missing] = np.arange(start, start + missing.sum())
+    df[ID_COLUMN] = ids.astype('int64')
+    df.index = df[ID_COLUMN].to_numpy()
+    if not df.index.is_unique:
+        duplicates = sorted(set(df.index[df.index.duplicated()]))[:5]
+        raise ValueError(f"Duplicate {ID_COLUMN} values: {duplicates}")
+    return not had_ids or bool(missing.any())
+
+def _apply_updates(df, updates):
+    for col, values in updates.items():
+        # Entries for rows that never reached the CSV, or are in another chunk, are ignored
+        labels = [label for label in values if label in df.index]
+        if not labels:
+            continue
+        column = df[col].astype(object) if col in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+        column.loc[labels] = [np.nan if values[label] is None else values[label] for label in labels]
+        df[col] = column.infer_objects()
+
+def _next_free_id(csv_file):
+    ids = pd.to_numeric(pd.read_csv(csv_file, usecols=[ID_COLUMN])[ID_COLUMN], errors='coerce')
+    return 0 if ids.isna().all() else int(ids.max()) + 1
+
+# ====================== BINARY SNAPSHOT ======================
+class CsvSnapshot:
+    """Binary copy of a CSV that is reused while the CSV has only grown by appends"""
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+        base = os.path.splitext(csv_file)[0]
+        self.data_file = base + (".feather" if feather is not None else ".pkl")
+        self.meta_file = base + ".snapshot.json"
+
+    def _prefix_digest(self, size):
+        # The whole prefix, so an edit anywhere in it is caught; hashing is still far cheaper than parsing
+        digest = hashlib.sha1()
+        with open(self.csv_file, 'rb') as f:
+            while size > 0:
+                block = f.read(min(size, DIGEST_CHUNK_BYTES))
+                if not block:
+                    break
+                digest.update(block)
+                size -= len(block)
+        return digest.hexdigest()
+
+    def load(self):
+        """Return (frame, rows read from the CSV tail), or (None, 0) if the snapshot is stale"""
+        if not (os.path.exists(self.meta_file) and os.path.exists(self.data_file)):
+            return None, 0
+        with open(self.meta_file, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        stat = os.stat(self.csv_file)
+        csv_size = stat.st_size
+        if csv_size < meta['csv_size']:
+            return None, 0
+        # An untouched CSV needs no hashing; one written since may only have had rows appended
+        if (csv_size, stat.st_mtime_ns) != (meta['csv_size'], meta.get('csv_mtime_ns')) and \
+                self._prefix_digest(meta['csv_size']) != meta['digest']:
+            return None, 0
+
+        if feather is not None:
+            df = feather.read_table(self.data_file, memory_map=True).to_pandas()
+        else:
+            with open(self.data_file, 'rb') as f:
+                df = pickle.load(f)
+        if len(df) != meta['rows'] or list(df.columns) != meta['columns']:
+            return None, 0
+
+        # Rows appended to the CSV after the snapshot was taken
+        if csv_size == meta['csv_size']:
+            return df, 0
+        with open(self.csv_file, 'rb') as f:
+            f.seek(meta['csv_size'])
+            tail = pd.read_csv(f, header=None, names=meta['columns'])
+        tail.index = pd.RangeIndex(len(df), len(df) + len(tail))
+        return pd.concat([df, tail]), len(tail)
+
+    def save(self, df):
+        """Write the snapshot for the CSV as it is on disk right now"""
+        try:
+            frame = df.reset_index(drop=True)
+            tmp_file = self.data_file + ".tmp"
+            if feather is not None:
+                feather.write_feather(frame, tmp_file)
+            else:
+                frame.to_pickle(tmp_file)
+            os.replace(tmp_file, self.data_file)
+        except (TypeError, ValueError):
+            # Mixed-type columns cannot be stored column-wise; fall back to parsing the CSV
+            self.clear()
+            return
+
+        stat = os.stat(self.csv_file)
+        meta = {'csv_size': stat.st_size, 'csv_mtime_ns': stat.st_mtime_ns,
+                'digest': self._prefix_digest(stat.st_size),
+                'rows': len(frame), 'columns': list(frame.columns)}
+        with open(self.meta_file + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(self.meta_file + ".tmp", self.meta_file)
+
+    def clear(self):
+        for path in (self.meta_file, self.data_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+# ====================== CSV + JOURNAL STORE ======================
+class CsvJournalStore:
+    """CSV storage that appends new rows and journals edits instead of rewriting the file"""
+    def __init__(self, csv_file, compact_every=COMPACT_EVERY):
+        self.csv_file = csv_file
+        self.journal_file = os.path.splitext(csv_file)[0] + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.columns = None
+        self.journal_entries = 0
+        self.frame = None
+        self.usernames = None
+        self.snapshot = CsvSnapshot(csv_file)
+
+    def _read_header(self):
+        return list(pd.read_csv(self.csv_file, nrows=0).columns)
+
+    def load(self, default_columns=()):
+        """Read the CSV and replay the journal on top of it"""
+        if not os.path.exists(self.csv_file):
+            pd.DataFrame(columns=list(default_columns)).to_csv(self.csv_file, index=False)
+
+        # Use the binary snapshot when it is still a prefix of the CSV
+        df, tail_rows = self.snapshot.load()
+        if df is None:
+            df = pd.read_csv(self.csv_file)
+            self.snapshot.save(df)
+        elif tail_rows > SNAPSHOT_REFRESH_ROWS:
+            self.snapshot.save(df)
+        # The journal is keyed by CandidateId; rows that lack one are numbered and saved
+        # right away, as the next free ids would differ once more rows are appended
+        assigned = assign_candidate_ids(df)
+        self.columns = list(df.columns)
+        self.journal_entries = self._replay(df)
+        self._track(df)
+        if assigned:
+            self.save(df)
+        return df
+
+    def _journal_updates(self, columns=None):
+        """(entries, {column: {CandidateId: latest value}}) from the journal, for the given columns"""
+        if not os.path.exists(self.journal_file):
+            return 0, {}
+
+        # Later entries win, so collapse the journal to the latest value per cell first
+        entries = 0
+        updates = {}
+        with open(self.journal_file, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                entries += 1
+                for col, value in entry['values'].items():
+                    if columns is None or col in columns:
+                        updates.setdefault(col, {})[entry['id']] = value
+        return entries, updates
+
+    def _replay(self, df):
+        entries, updates = self._journal_updates()
+        _apply_updates(df, updates)
+        return entries
+
+    def read_chunks(self, columns=None, chunk_size=READ_CHUNK_ROWS):
+        """Yield the table chunk_size rows at a time, reading only the given columns"""
+        # Chunks are indexed by CandidateId with the journal applied, so they match load() row for row
+        if not os.path.exists(self.csv_file):
+            return
+        header = self._read_header()
+        wanted = header if columns is None else [col for col in header if col in columns or col == ID_COLUMN]
+        _, updates = self._journal_updates(wanted)
+        next_id = None
+        for chunk in pd.read_csv(self.csv_file, usecols=wanted, chunksize=chunk_size):
+            if ID_COLUMN in chunk.columns and chunk[ID_COLUMN].isna().any():
+                # Only files the application never opened lack ids; number them as load() would
+                if next_id is None:
+                    next_id = _next_free_id(self.csv_file)
+                missing = chunk[ID_COLUMN].isna().to_numpy()
+                chunk.loc[missing, ID_COLUMN] = np.arange(next_id, next_id + missing.sum())
+                next_id += int(missing.sum())
+            # Without an id column the running row numbers are the ids, as in load()
+            assign_candidate_ids(chunk)
+            _apply_updates(chunk, updates)
+            yield chunk
+
+    def append(self, df, labels):
+        """Append the given rows of df to the end of the CSV"""
+        self._track(df, labels)
+        if self.needs_rewrite(df):
+            return self.save(df)
+        df.loc[list(labels), self.columns].to_csv(self.csv_file, mode="a", header=False, index=False)
+
+    def update(self, df, labels, columns):
+        """Journal new values of some columns for existing rows"""
+        labels = list(labels)
+        self._track(df, labels if 'Username' in columns else ())
+        if self.needs_rewrite(df) or self.journal_entries + len(labels) > self.compact_every:
+            return self.save(df)
+
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            for label in labels:
+                values = {col: _clean(df.at[label, col]) for col in columns}
+                entry = {'id': _clean(label), 'values': values}
+                f.write(json.dumps(entry, default=_json_default) + "\n")
+        self.journal_entries += len(labels)
+
+    def save(self, df):
+        """Compact: rewrite the whole CSV from df and clear the journal"""
+        tmp_file = self.csv_file + ".tmp"
+        df.to_csv(tmp_file, index=False)
+        os.replace(tmp_file, self.csv_file)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.snapshot.save(df)
+        self.columns = list(df.columns)
+        self.journal_entries = 0
+        self._track(df)
+
+    def version(self):
+        """A stamp that changes whenever the CSV or its journal is written"""
+        return (_file_stamp(self.csv_file), _file_stamp(self.journal_file))
+
+    def needs_rewrite(self, df):
+        """Whether writing rows of df means rewriting the whole CSV, as its columns changed"""
+        # Appended rows and journaled values must line up with the CSV header
+        if self.columns is None:
+            self.columns = self._read_header() if os.path.exists(self.csv_file) else None
+        return self.columns is None or set(df.columns) != set(self.columns)
+
+    def track(self, df):
+        """Answer queries from df, the application's table after new rows were merged into it"""
+        # Every row in df was already appended, so the username index stays valid
+        self.frame = df
+
+    def _track(self, df, labels=None):
+        # Queries are answered from the frame the application is working on; appended
+        # rows may come in a frame of their own, which only feeds the username index
+        if labels is None:
+            self.frame = df
+            # Rebuilt lazily on the first username query
+            self.usernames = None
+        elif self.usernames is not None and 'Username' in df.columns:
+            for label, username in zip(labels, df.loc[list(labels), 'Username']):
+                username = _normalize_username(username)
+                if username:
+                    self.usernames.setdefault(username, label)
+
+    def _username_index(self):
+        if self.usernames is None:
+            if 'Username' in self.frame.columns:
+                names = self.frame['Username'].astype(object).where(self.frame['Username'].notna(), "")
+                names = names.astype(str).str.strip().str.lower()
+                keep = (names != "") & ~names.duplicated()
+                self.usernames = dict(zip(names[keep], self.frame.index[keep]))
+            else:
+                self.usernames = {}
+        return self.usernames
+
+    # ---------------------- queries ----------------------
+    def credentials(self):
+        usernames = self._username_index()
+        return dict(zip(usernames, self.frame.loc[list(usernames.values()), 'Password']))
+
+    def find_by_username(self, username):
+        label = self._username_index().get(_normalize_username(username))
+        return None if label is None else self.frame.loc[label]
+
+# ====================== SQLITE STORE ======================
+class SqliteStore:
+    """SQLite storage with indexed lookups by row and by username"""
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.columns = self._table_columns()
+        if self.columns is not None:
+            # Databases created before an index was added or dropped are brought in line
+            with self.conn:
+                self._create_indexes()
+
+    def _table_columns(self):
+        rows = self.conn.execute(f"PRAGMA table_info({TABLE})").fetchall()
+        return [row[1] for row in rows if row[1] != 'row_id'] or None
+
+    def _create_indexes(self):
+        self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_row_id ON {TABLE}(row_id)")
+        for name in UNUSED_INDEXES:
+            self.conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+        if 'Username' in self.columns:
+            # Usernames are matched as the CSV store matches them: trimmed and lowercased
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_username_normalized "
+                              f"ON {TABLE}({NORMALIZED_USERNAME_SQL})")
+
+    def load(self, default_columns=()):
+        if self.columns is None:
+            self.save(pd.DataFrame(columns=list(default_columns)))
+        df = pd.read_sql_query(f"SELECT * FROM {TABLE} ORDER BY row_id", self.conn, index_col='row_id')
+        df.index.name = None
+        if assign_candidate_ids(df):
+            self.save(df)
+        return df
+
+    def read_chunks(self, columns=None, chunk_size=READ_CHUNK_ROWS):
+        """Yield the table chunk_size rows at a time, reading only the given columns"""
+        if self.columns is None:
+            return
+        wanted = [col for col in self.columns if columns is None or col in columns or col == ID_COLUMN]
+        selected = ", ".join(f'"{col}"' for col in ['row_id'] + wanted)
+        for chunk in pd.read_sql_query(f"SELECT {selected} FROM {TABLE} ORDER BY row_id", self.conn,
+                                       index_col='row_id', chunksize=chunk_size):
+            chunk.index.name = None
+            yield chunk
+
+    def append(self, df, labels):
+        if self.needs_rewrite(df):
+            return self.save(df)
+        with self.conn:
+            df.loc[list(labels), self.columns].to_sql(TABLE, self.conn, if_exists="append",
+                                                      index=True, index_label='row_id')
+
+    def update(self, df, labels, columns):
+        if self.needs_rewrite(df):
+            return self.save(df)
+        assignments = ", ".join(f'"{col}" = ?' for col in columns)
+        rows = [[_sql_value(df.at[label, col]) for col in columns] + [_sql_value(label)] for label in labels]
+        with self.conn:
+            self.conn.executemany(f"UPDATE {TABLE} SET {assignments} WHERE row_id = ?", rows)
+
+    def save(self, df):
+        with self.conn:
+            df.to_sql(TABLE, self.conn, if_exists="replace", index=True, index_label='row_id')
+            self.columns = list(df.columns)
+            self._create_indexes()
+
+    def version(self):
+        """A stamp that changes whenever the database is written"""
+        # Committed writes may sit in the write-ahead log until it is checkpointed
+        return (_file_stamp(self.db_file), _file_stamp(self.db_file + "-wal"))
+
+    def needs_rewrite(self, df):
+        """Whether writing rows of df means rewriting the whole table, as its columns changed"""
+        return self.columns is None or set(df.columns) != set(self.columns)
+
+    def track(self, df):
+        """Queries read the database, so there is no frame to follow"""
+
+    # ---------------------- queries ----------------------
+    def _rows(self, sql, params=()):
+        cursor = self.conn.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        return names, cursor.fetchall()
+
+    def credentials(self):
+        _, rows = self._rows(f"SELECT Username, Password FROM {TABLE} ORDER BY row_id DESC")
+        return {_normalize_username(u): p for u, p in rows if _normalize_username(u)}
+
+    def find_by_username(self, username):
+        names, rows = self._rows(f"SELECT * FROM {TABLE} WHERE {NORMALIZED_USERNAME_SQL} = ? "
+                                 f"ORDER BY row_id LIMIT 1",
+                                 (_normalize_username(username),))
+        if not rows:
+            return None
+        row = pd.Series(dict(zip(names, rows[0])))
+        return row.drop('row_id').rename(row['row_id'])
+
+# ====================== STORE REGISTRY ======================
+_stores = {}
+
+def open_store(csv_file, backend=None):
+    """Create the store for a dataset; the SQLite backend is seeded from the CSV on first use"""
+    backend = backend or STORAGE_BACKEND
+    if backend == "csv":
+        return CsvJournalStore(csv_file)
+    if backend == "sqlite":
+        db_file = os.path.splitext(csv_file)[0] + ".db"
+        seed = not os.path.exists(db_file) and os.path.exists(csv_file)
+        store = SqliteStore(db_file)
+        if seed:
+            store.save(CsvJournalStore(csv_file).load())
+        return store
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+def get_store(csv_file):
+    """Return the single store instance for a dataset"""
+    if csv_file not in _stores:
+        _stores[csv_file] = open_store(csv_file)
+    return _stores[csv_file]
@@ -0,0 +1,83 @@
+# Application rules shared by the registration form and the batch scorer; no heavy imports
+from constants import JOB_ROLES
+
+# ====================== CONSTANTS ======================
+# Field -> name used in its error message, in the order the form checks them
+REQUIRED_FIELDS = {
+    'Name': "Full Name",
+    'Age': "Age",
+    'Country': "Country",
+    'YearsCode': "Total Coding Experience",
+    'YearsCodePro': "Professional Coding Experience",
+    'HaveWorkedWith': "Technologies Worked With",
+    'PreviousSalary': "Previous Salary",
+    'Username': "Username",
+}
+MIN_AGE = 18
+MAX_AGE = 70
+GENDERS = ["Male", "Female", "Other"]
+ED_LEVELS = ["High School", "Bachelor", "Master", "PhD"]
+MENTAL_HEALTH_LEVELS = ["Good", "Fair", "Poor"]
+MIN_COMPUTER_SKILLS = 1
+MAX_COMPUTER_SKILLS = 10
+# Accepted spellings of the Employed checkbox, lowercased -> the stored 0/1
+EMPLOYED_VALUES = {'1': 1, 'true': 1, 'yes': 1, '0': 0, 'false': 0, 'no': 0}
+# Field -> (name used in its error message, allowed values) for the form's fixed choices
+CHOICE_FIELDS = {
+    'Gender': ("Gender", GENDERS),
+    'EdLevel': ("Education Level", ED_LEVELS),
+    'MentalHealth': ("Mental Health", MENTAL_HEALTH_LEVELS),
+    'JobRole': ("Desired Job Role", JOB_ROLES),
+}
+# What the form starts on, for fields an application leaves blank; a JobRole must be chosen
+FORM_DEFAULTS = {'Gender': GENDERS[0], 'EdLevel': ED_LEVELS[0], 'ComputerSkills': 5,
+                 'MentalHealth': MENTAL_HEALTH_LEVELS[0], 'Employed': 1}
+
+# ====================== VALIDATION ======================
+def validate_application(fields, usernames=()):
+    """The first error in an application's raw text fields, or None if it is valid"""
+    # fields maps column names to the text as entered; usernames holds the taken, lowercased ones
+    values = {col: "" if fields.get(col) is None else str(fields.get(col)) for col in REQUIRED_FIELDS}
+    for col, name in REQUIRED_FIELDS.items():
+        if not values[col].strip():
+            return f"Please fill in the {name} field"
+
+    try:
+        age = int(values['Age'])
+    except ValueError:
+        return "Age must be a valid number"
+    if age < MIN_AGE or age > MAX_AGE:
+        return f"Age must be between {MIN_AGE} and {MAX_AGE}"
+
+    try:
+        years_code = float(values['YearsCode'])
+        years_pro = float(values['YearsCodePro'])
+    except ValueError:
+        return "Experience years must be valid numbers"
+    if years_pro > years_code:
+        return "Professional experience cannot exceed total coding experience"
+
+    try:
+        float(values['PreviousSalary'])
+    except ValueError:
+        return "Salary must be a valid number"
+
+    # The form's own widgets only offer valid choices, so these are checked when given
+    for col, (name, choices) in CHOICE_FIELDS.items():
+        if col in fields and not str(fields[col]).strip():
+            return f"Please choose a {name}"
+        if col in fields and str(fields[col]) not in choices:
+            return f"{name} must be one of: {', '.join(choices)}"
+    if 'ComputerSkills' in fields:
+        try:
+            computer_skills = int(str(fields['ComputerSkills']))
+        except ValueError:
+            return "Computer Skills must be a whole number"
+        if computer_skills < MIN_COMPUTER_SKILLS or computer_skills > MAX_COMPUTER_SKILLS:
+            return f"Computer Skills must be between {MIN_COMPUTER_SKILLS} and {MAX_COMPUTER_SKILLS}"
+    if 'Employed' in fields and str(fields['Employed']).strip().lower() not in EMPLOYED_VALUES:
+        return "Currently Employed must be one of: 0, 1, true, false, yes, no"
+
+    if values['Username'].strip().lower() in usernames:
+        return "Username already exists. Please choose a different one."
+    return None
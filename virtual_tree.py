@@ -0,0 +1,148 @@
+import tkinter as tk
+from tkinter import ttk
+
+# ====================== CONSTANTS ======================
+DEFAULT_ROW_HEIGHT = 20
+WHEEL_ROWS = 3
+MODIFIER_MASK = 0x0005  # Shift or Control held during a click
+
+# ====================== VIRTUAL TREEVIEW ======================
+class VirtualTreeview:
+    """A Treeview that only holds the rows in view, reading them from a row source on scroll"""
+    # The source needs len() and fetch(start, stop) returning row ids; row_values
+    # turns a list of ids into the column values shown for them. Row ids become
+    # the Treeview item ids, so a selection survives scrolling and refreshes.
+    def __init__(self, parent, columns, row_values, selectmode="browse", **tree_options):
+        self.row_values = row_values
+        self.selectmode = selectmode
+        self.source = None
+        self.first = 0
+        self.visible = 1
+        # Selected ids, including rows scrolled out of view, and the row arrow keys move from
+        self.selected = []
+        self.cursor = None
+        self._shown_selection = ()
+        self._extending = False
+
+        self.scrollbar = tk.Scrollbar(parent, command=self.scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(parent, columns=[col for col, _ in columns],
+                                 show="headings", selectmode=selectmode, **tree_options)
+        for col, width in columns:
+            self.tree.column(col, width=width, anchor=tk.CENTER)
+            self.tree.heading(col, text=col)
+        self.tree.pack(expand=True, fill=tk.BOTH)
+
+        row_height = ttk.Style().lookup("Treeview", "rowheight")
+        self.row_height = int(row_height) if row_height else DEFAULT_ROW_HEIGHT
+        self.tree.bind("<Configure>", self._resized)
+        self.tree.bind("<<TreeviewSelect>>", self._selected)
+        self.tree.bind("<Button-1>", self._clicked, add="+")
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll("scroll", -event.delta // 120 * WHEEL_ROWS, "units"))
+        self.tree.bind("<Button-4>", lambda event: self.scroll("scroll", -WHEEL_ROWS, "units"))
+        self.tree.bind("<Button-5>", lambda event: self.scroll("scroll", WHEEL_ROWS, "units"))
+        self.tree.bind("<Up>", lambda event: self._step(-1))
+        self.tree.bind("<Down>", lambda event: self._step(1))
+        self.tree.bind("<Prior>", lambda event: self.scroll("scroll", -1, "pages"))
+        self.tree.bind("<Next>", lambda event: self.scroll("scroll", 1, "pages"))
+
+    def set_source(self, source, keep_position=False):
+        """Show a new row source, from the top unless keep_position is set"""
+        self.source = source
+        if not keep_position:
+            self.first = 0
+            self.selected, self.cursor = [], None
+        self.redraw()
+
+    def selection(self):
+        """Ids of the selected rows, in the order they were selected"""
+        return tuple(self.selected)
+
+    def clear_selection(self):
+        self.selected, self.cursor = [], None
+        self._shown_selection = ()
+        self.tree.selection_set(())
+
+    def scroll(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", count, "units" | "pages")"""
+        if self.source is None:
+            return "break"
+        if args[0] == "moveto":
+            self.first = int(float(args[1]) * len(self.source))
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.first += int(args[1]) * step
+        self.redraw()
+        return "break"
+
+    def redraw(self):
+        """Replace the Treeview items with the rows currently in view"""
+        self.tree.delete(*self.tree.get_children())
+        if self.source is None:
+            return
+        self.first = max(0, min(self.first, len(self.source) - self.visible))
+        ids = self.source.fetch(self.first, self.first + self.visible)
+        if len(ids) < self.visible and self.first > 0:
+            # The source was shorter than it estimated; show its last page instead
+            self.first = max(0, len(self.source) - self.visible)
+            ids = self.source.fetch(self.first, self.first + self.visible)
+
+        for row_id, values in zip(ids, self.row_values(ids)):
+            self.tree.insert("", tk.END, iid=str(row_id), values=values)
+        self._shown_selection = tuple(iid for iid in self.selected if self.tree.exists(iid))
+        self.tree.selection_set(self._shown_selection)
+
+        total = max(len(self.source), 1)
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
+
+    def _resized(self, event):
+        # Include the partly visible last row; the Treeview clips it
+        visible = max(1, event.height // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.redraw()
+
+    def _clicked(self, event):
+        self._extending = self.selectmode == "extended" and bool(event.state & MODIFIER_MASK)
+
+    def _selected(self, event):
+        # Redraws also fire this event; only a change from what was last shown is the user's
+        selection = self.tree.selection()
+        if set(selection) == set(self._shown_selection):
+            return
+        if self._extending:
+            # Ctrl/Shift-click edits the rows in view and keeps those scrolled away
+            visible = set(self.tree.get_children())
+            kept = [iid for iid in self.selected if iid not in visible]
+            self.selected = kept + [iid for iid in selection if iid not in kept]
+        else:
+            self.selected = list(selection)
+        self._shown_selection = selection
+        self._extending = False
+        if self.tree.focus() in selection:
+            self.cursor = self.tree.focus()
+        elif selection:
+            self.cursor = selection[-1]
+
+    def _step(self, offset):
+        # Arrow keys move the selection by rank, scrolling once it leaves the view
+        items = self.tree.get_children()
+        if not items:
+            return "break"
+        if self.cursor in items:
+            target = max(0, min(self.first + items.index(self.cursor) + offset, len(self.source) - 1))
+        else:
+            target = self.first
+        # The last row in view may be cut off, so keep the target above it
+        fully_visible = max(1, self.visible - 1)
+        if target < self.first or target >= self.first + fully_visible:
+            self.first = target if offset < 0 else target - fully_visible + 1
+            self.redraw()
+            items = self.tree.get_children()
+        if items:
+            self.cursor = items[max(0, min(target - self.first, len(items) - 1))]
+            self.selected = [self.cursor]
+            self._shown_selection = (self.cursor,)
+            self.tree.selection_set(self.cursor)
+            self.tree.focus(self.cursor)
+        return "break"